@@ -0,0 +1,98 @@
+"""
+Benchmark the scraper's shared browser pool against a launch per URL.
+
+Serves small article pages locally and loads each one the way the scraper
+does, first launching Chromium for every URL as the tool used to, then
+through BrowserPool, and reports wall time, launches and the launch cost
+amortized over every page.
+
+Usage:
+    python benchmarks/bench_browser_pool.py [--urls 30] [--recycle-after 50]
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "linkedin_automation"))
+
+from playwright.async_api import async_playwright
+from tools.browser_pool import BrowserPool
+
+PAGE = (
+    "<html><head><title>Article {n}</title></head><body><h1>Article {n}</h1>"
+    + "<p>Crowdfunding campaigns keep moving to community-led models.</p>" * 50
+    + "</body></html>"
+)
+
+
+class ArticleHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = PAGE.format(n=self.path.strip("/")).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def load(page, url: str) -> str:
+    await page.goto(url, wait_until="networkidle")
+    return await page.content()
+
+
+async def launch_per_url(urls) -> dict:
+    launch_seconds = 0.0
+    for url in urls:
+        async with async_playwright() as p:
+            started = time.perf_counter()
+            browser = await p.chromium.launch(headless=True)
+            launch_seconds += time.perf_counter() - started
+            page = await browser.new_page()
+            await load(page, url)
+            await browser.close()
+    return {"launches": len(urls), "launch_seconds": launch_seconds}
+
+
+async def pooled(urls, recycle_after: int) -> dict:
+    pool = BrowserPool(recycle_after=recycle_after)
+    for url in urls:
+        await pool.run(lambda page: load(page, url))
+    pool.shutdown()
+    return pool.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--urls", type=int, default=30, help="Pages to scrape")
+    parser.add_argument("--recycle-after", type=int, default=50, help="Pages a pooled browser serves")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ArticleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_port}/{n}" for n in range(args.urls)]
+
+    for label, scrape in (
+        ("launch per URL", lambda: launch_per_url(urls)),
+        ("browser pool", lambda: pooled(urls, args.recycle_after)),
+    ):
+        started = time.perf_counter()
+        # A fresh loop per configuration, like separate tool calls
+        stats = asyncio.run(scrape())
+        elapsed = time.perf_counter() - started
+        print(
+            f"{label:>15}: {elapsed:6.2f}s total, {elapsed / len(urls) * 1000:7.1f}ms/page, "
+            f"{stats['launches']} launches, "
+            f"launch cost {stats['launch_seconds'] / len(urls) * 1000:6.1f}ms/page amortized"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
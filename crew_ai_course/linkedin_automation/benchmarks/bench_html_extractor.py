@@ -0,0 +1,110 @@
+"""
+Benchmark the scraper's single-pass HTML extractor against BeautifulSoup.
+
+Parses every page the way the scraper used to (a BeautifulSoup tree walked
+once for text, once for headings and once for links) and then with
+html_extractor.extract, on lxml and on the standard library parser, and
+reports pages per second and peak traced memory. Outputs are compared so a
+speedup never comes from dropping content.
+
+Usage:
+    python benchmarks/bench_html_extractor.py [--corpus DIR] [--pages 50] [--repeat 3]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "linkedin_automation"))
+
+from bs4 import BeautifulSoup
+from tools.html_extractor import etree, extract
+
+NAV = "<nav>" + "<a href=\"/nav\">Menu</a>" * 30 + "</nav>"
+SECTION = (
+    "<section><h2>Section {n}</h2>"
+    + "<p>Crowdfunding campaigns keep moving to <a href=\"/topics/{n}\">community-led</a> models.</p>" * 40
+    + "<ul>" + "<li><a href=\"/related/{n}\">Related story</a></li>" * 20 + "</ul>"
+    + "<script>window.track({n});</script></section>"
+)
+
+
+def synthetic_pages(count: int):
+    """Large article pages with navigation, sections, links and scripts."""
+    for n in range(count):
+        yield (
+            f"<html lang=\"en\"><head><title>Article {n}</title>"
+            f"<meta name=\"description\" content=\"Article {n}\"><style>body {{ margin: 0 }}</style></head>"
+            f"<body>{NAV}<h1>Article {n}</h1>"
+            + "".join(SECTION.format(n=s) for s in range(25))
+            + "</body></html>"
+        )
+
+
+def load_corpus(directory: Path):
+    return [path.read_text(encoding="utf-8", errors="replace") for path in sorted(directory.glob("*.html"))]
+
+
+def with_soup(html: str) -> dict:
+    soup = BeautifulSoup(html, "html.parser")
+    return {
+        "text": soup.get_text(separator="\n", strip=True),
+        "headings": [h.get_text(strip=True) for h in soup.find_all(["h1", "h2", "h3"])],
+        "links": [a["href"] for a in soup.find_all("a", href=True)],
+    }
+
+
+def measure(parse, pages, repeat: int):
+    """Best pages/sec over repeat runs and the peak traced memory of one run."""
+    best = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for html in pages:
+            parse(html)
+        best = max(best, len(pages) / (time.perf_counter() - started))
+    tracemalloc.start()
+    results = [parse(html) for html in pages]
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, results
+
+
+def mismatches(expected, actual) -> int:
+    return sum(
+        1 for old, new in zip(expected, actual)
+        if any(old[key] != new[key] for key in ("text", "headings", "links"))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="Directory of saved .html pages; synthetic pages otherwise")
+    parser.add_argument("--pages", type=int, default=50, help="Synthetic pages to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per parser")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus) if args.corpus else list(synthetic_pages(args.pages))
+    if not pages:
+        parser.error(f"No .html files in {args.corpus}")
+    size = sum(len(html) for html in pages)
+    print(f"{len(pages)} pages, {size / len(pages) / 1024:.0f} KiB average")
+
+    parsers = [("beautifulsoup", with_soup)]
+    if etree is not None:
+        parsers.append(("extract lxml", lambda html: extract(html, use_lxml=True)))
+    parsers.append(("extract stdlib", lambda html: extract(html, use_lxml=False)))
+
+    baseline = None
+    for label, parse in parsers:
+        rate, peak, results = measure(parse, pages, args.repeat)
+        line = f"{label:>15}: {rate:8.1f} pages/s, peak {peak / 1024 / 1024:6.1f} MiB"
+        if baseline is None:
+            baseline = (rate, results)
+        else:
+            line += f", {rate / baseline[0]:4.1f}x, {mismatches(baseline[1], results)} mismatched pages"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, agent, crew, task, after_kickoff
+from tools.browser_pool import shutdown_browser_pool
 from tools.scraper import PlaywrightScraperTool
 from crewai_tools import FileWriterTool
 
@@ -75,6 +76,12 @@ class LinkedinAutomation():
 	
 
 
+	@after_kickoff
+	def close_browsers(self, output):
+		"""Close the scraper's shared browsers once the crew is done"""
+		shutdown_browser_pool()
+		return output
+
 	@crew
 	def crew(self) -> Crew:
 		"""Creates the LinkedinAutomation crew"""
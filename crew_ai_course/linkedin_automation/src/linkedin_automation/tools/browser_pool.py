@@ -0,0 +1,195 @@
+import asyncio
+import atexit
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from playwright.async_api import async_playwright
+
+T = TypeVar("T")
+
+
+@dataclass
+class _BrowserSlot:
+    browser: object
+    context: object
+    pages_served: int = 0
+    active: int = 0
+    retired: bool = False
+
+
+class BrowserPool:
+    """
+    Warm Chromium browsers shared by every scraper call in the process.
+
+    Tools may run their coroutines on a fresh event loop per call, while
+    Playwright objects are bound to the loop that created them. The pool
+    therefore owns a dedicated loop thread and every page runs there.
+    """
+
+    def __init__(
+        self,
+        max_browsers: int = 2,
+        max_pages: int = 8,
+        recycle_after: int = 50,
+        headless: bool = True
+    ):
+        """
+        Args:
+            max_browsers: Browsers kept running at once
+            max_pages: Pages open at once across all browsers
+            recycle_after: Pages a browser serves before it is replaced
+            headless: Launch browsers without a window
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_browsers = max_browsers
+        self.max_pages = max_pages
+        self.recycle_after = recycle_after
+        self.headless = headless
+        self.stats = {"launches": 0, "pages": 0, "recycled": 0, "crashes": 0, "launch_seconds": 0.0}
+        self._slots: List[_BrowserSlot] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._playwright = None
+        self._pages: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self._closers: List[Callable[[], Awaitable[None]]] = []
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if not self._loop:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="browser-pool", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args) -> T:
+        """Await fn(*args) on the pool's loop from any event loop."""
+        future = asyncio.run_coroutine_threadsafe(fn(*args), self._ensure_loop())
+        return await asyncio.wrap_future(future)
+
+    def on_close(self, closer: Callable[[], Awaitable[None]]):
+        """Register a coroutine function awaited on the pool's loop at shutdown."""
+        self._closers.append(closer)
+
+    async def run(self, fn: Callable[[object], Awaitable[T]]) -> T:
+        """
+        Run fn(page) on a pooled page and return its result.
+
+        Can be awaited from any event loop; the page itself lives on the
+        pool's loop and is closed afterwards.
+        """
+        return await self.call(self._with_page, fn)
+
+    async def _with_page(self, fn: Callable[[object], Awaitable[T]]) -> T:
+        if not self._pages:
+            self._pages = asyncio.Semaphore(self.max_pages)
+            self._launch_lock = asyncio.Lock()
+        async with self._pages:
+            slot = await self._acquire_slot()
+            page = None
+            crashed = False
+            try:
+                page = await slot.context.new_page()
+                return await fn(page)
+            except Exception:
+                crashed = not slot.browser.is_connected()
+                raise
+            finally:
+                if page and not crashed:
+                    await asyncio.gather(page.close(), return_exceptions=True)
+                await self._release_slot(slot, crashed)
+
+    async def _acquire_slot(self) -> _BrowserSlot:
+        async with self._launch_lock:
+            live = [slot for slot in self._slots if not slot.retired]
+            idle = [slot for slot in live if slot.active == 0]
+            if idle or len(live) >= self.max_browsers:
+                slot = min(idle or live, key=lambda s: s.active)
+            else:
+                slot = await self._launch()
+            slot.active += 1
+            slot.pages_served += 1
+            self.stats["pages"] += 1
+            if slot.pages_served >= self.recycle_after:
+                slot.retired = True
+            return slot
+
+    async def _launch(self) -> _BrowserSlot:
+        started = self._loop.time()
+        if not self._playwright:
+            self._playwright = await async_playwright().start()
+        browser = await self._playwright.chromium.launch(headless=self.headless)
+        context = await browser.new_context()
+        slot = _BrowserSlot(browser, context)
+        browser.on("disconnected", lambda _: self._mark_crashed(slot))
+        self._slots.append(slot)
+        self.stats["launches"] += 1
+        self.stats["launch_seconds"] += self._loop.time() - started
+        return slot
+
+    def _mark_crashed(self, slot: _BrowserSlot):
+        if slot in self._slots and not slot.retired:
+            self.logger.warning("Pooled browser disconnected, replacing it")
+            self.stats["crashes"] += 1
+            slot.retired = True
+
+    async def _release_slot(self, slot: _BrowserSlot, crashed: bool):
+        slot.active -= 1
+        if crashed and not slot.retired:
+            self.stats["crashes"] += 1
+            slot.retired = True
+        if slot.retired and slot.active == 0 and slot in self._slots:
+            self._slots.remove(slot)
+            if slot.browser.is_connected():
+                self.stats["recycled"] += 1
+            await asyncio.gather(slot.browser.close(), return_exceptions=True)
+
+    async def _close_all(self):
+        closers, self._closers = self._closers, []
+        await asyncio.gather(*(closer() for closer in closers), return_exceptions=True)
+        slots, self._slots = self._slots, []
+        await asyncio.gather(*(slot.browser.close() for slot in slots), return_exceptions=True)
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def shutdown(self, timeout: float = 30):
+        """Close every browser and stop the pool's loop thread."""
+        with self._start_lock:
+            loop, self._loop = self._loop, None
+        if not loop:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_all(), loop).result(timeout)
+        except Exception as e:
+            self.logger.error(f"Error closing browser pool: {str(e)}")
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout)
+        loop.close()
+        self._pages = self._launch_lock = None
+        self.logger.info(f"Browser pool stats: {self.stats}")
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if not _pool:
+            _pool = BrowserPool()
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def shutdown_browser_pool():
+    """Close the process-wide pool if one was started."""
+    with _pool_lock:
+        pool = _pool
+    if pool:
+        pool.shutdown()
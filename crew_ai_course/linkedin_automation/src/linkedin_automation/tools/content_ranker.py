@@ -0,0 +1,176 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .html_extractor import TextBlock
+
+# Characters of page text handed to the agent per URL
+CONTENT_BUDGET = 2000
+
+# Blocks shorter than this are kept only when they are headings or part of
+# a run of short blocks, such as list items or table cells, that is longer
+MIN_WORDS = 8
+# Blocks whose text is mostly link labels are menus, tag clouds and related-story lists
+MAX_LINK_DENSITY = 0.5
+# Selection stops once less than this much budget is left
+MIN_FILL_CHARS = 80
+# Below this share of what plain truncation would return, the page text is used instead
+FALLBACK_RATIO = 0.5
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "was", "what", "with", "about",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+@dataclass
+class _Candidate:
+    position: int
+    text: str
+    terms: Counter
+    length: int
+    score: float = 0.0
+
+
+def _link_density(block: TextBlock) -> float:
+    return block.link_chars / max(len(block.text), 1)
+
+
+def _is_boilerplate(block: TextBlock) -> bool:
+    if block.chrome or _link_density(block) > MAX_LINK_DENSITY:
+        return True
+    return len(block.text.split()) < MIN_WORDS
+
+
+def _merge_short(blocks: List[TextBlock]) -> List[TextBlock]:
+    """Join runs of short, sparsely linked blocks such as bullets or table cells into one block."""
+    merged = []
+    run: List[TextBlock] = []
+
+    def flush():
+        if len(run) == 1:
+            merged.append(run[0])
+        elif run:
+            merged.append(TextBlock("\n".join(b.text for b in run), sum(b.link_chars for b in run)))
+        run.clear()
+
+    for block in blocks:
+        if (not block.heading and not block.chrome and len(block.text.split()) < MIN_WORDS
+                and _link_density(block) <= MAX_LINK_DENSITY):
+            run.append(block)
+            continue
+        flush()
+        merged.append(block)
+    flush()
+    return merged
+
+
+def segment(blocks: List[TextBlock]) -> List[_Candidate]:
+    """
+    Drop boilerplate blocks and attach each heading to the block after it.
+
+    Args:
+        blocks: Blocks in document order from html_extractor.extract
+
+    Returns:
+        Content blocks in document order, ready to be scored
+    """
+    candidates = []
+    heading = None
+    for block in blocks:
+        if block.heading and not block.chrome:
+            heading = block.text
+            continue
+        if _is_boilerplate(block):
+            continue
+        text = f"{heading}\n{block.text}" if heading else block.text
+        heading = None
+        terms = tokenize(text)
+        candidates.append(_Candidate(len(candidates), text, Counter(terms), len(terms)))
+    return candidates
+
+
+def _score(candidates: List[_Candidate], query: List[str]):
+    """Okapi BM25 with document frequencies taken from the page's own blocks."""
+    count = len(candidates)
+    average = sum(c.length for c in candidates) / count or 1
+    for term in set(query):
+        frequency = sum(1 for c in candidates if term in c.terms)
+        if not frequency:
+            continue
+        idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+        for c in candidates:
+            tf = c.terms.get(term)
+            if tf:
+                c.score += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * c.length / average))
+
+
+def select_content(
+    blocks: List[TextBlock],
+    topic: Optional[str] = None,
+    budget: int = CONTENT_BUDGET,
+    page_text: str = ""
+) -> dict:
+    """
+    Pick the page text most worth sending to the agent within a character budget.
+
+    Runs of short blocks such as list items are merged, boilerplate is
+    dropped by link and text density, and blocks that match the topic are
+    taken first, best BM25 score first. Whatever budget is left is filled
+    with the remaining content blocks in document order, as is the whole
+    budget when there is no topic or nothing matches it. If that keeps much
+    less than the page text would have filled, the page text is used.
+
+    Args:
+        blocks: Blocks in document order from html_extractor.extract
+        topic: What the task is looking for
+        budget: Characters of text to return
+        page_text: The page's full text, the fallback when selection comes up short
+
+    Returns:
+        Dict with "content" (selected blocks in document order),
+        "blocks", "boilerplate" and "selected" counts and "fallback"
+    """
+    merged = _merge_short(blocks)
+    candidates = segment(merged)
+    query = tokenize(topic or "")
+    if candidates and query:
+        _score(candidates, query)
+    # Matching blocks by relevance, then the rest of the article in reading order
+    matching = sorted((c for c in candidates if c.score), key=lambda c: (-c.score, c.position))
+    order = matching + [c for c in candidates if not c.score]
+
+    chosen = []
+    remaining = budget
+    for c in order:
+        if remaining < MIN_FILL_CHARS:
+            break
+        if len(c.text) + 1 > remaining:
+            if chosen:
+                continue
+            # A single block longer than the budget is cut rather than skipped
+            c = _Candidate(c.position, c.text[:remaining], c.terms, c.length, c.score)
+        chosen.append(c)
+        remaining -= len(c.text) + 1
+
+    chosen.sort(key=lambda c: c.position)
+    content = "\n".join(c.text for c in chosen)
+    fallback = len(content) < min(budget, len(page_text)) * FALLBACK_RATIO
+    return {
+        "content": page_text[:budget] if fallback else content,
+        "blocks": len(blocks),
+        "boilerplate": sum(1 for b in merged if (b.chrome or not b.heading) and _is_boilerplate(b)),
+        "selected": len(chosen),
+        "fallback": fallback,
+    }
@@ -0,0 +1,211 @@
+import logging
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+try:
+    from lxml import etree
+except ImportError:  # declared as a dependency; the slower standard library parser is the fallback
+    etree = None
+
+logger = logging.getLogger(__name__)
+_warned_fallback = False
+
+HEADING_TAGS = {"h1", "h2", "h3"}
+# Their text is code or markup, not page content
+SKIPPED_TAGS = {"script", "style", "template"}
+# Tags that start a new block of text
+BLOCK_TAGS = {
+    "p", "div", "li", "ul", "ol", "td", "th", "tr", "table", "section", "article", "main",
+    "header", "footer", "nav", "aside", "blockquote", "pre", "figcaption", "dd", "dt", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "br", "hr", "body",
+}
+# Page chrome rather than content, whatever its text looks like
+CHROME_TAGS = {"nav", "footer", "aside", "form"}
+META_NAMES = {"description", "keywords", "author", "og:title", "og:description", "og:image", "og:type", "article:published_time"}
+
+
+@dataclass
+class TextBlock:
+    """Text between block-level tags, with what the ranker needs to judge it."""
+    text: str
+    link_chars: int = 0
+    heading: bool = False
+    chrome: bool = False
+
+
+class _ExtractionTarget:
+    """
+    Collects text, headings, links and metadata from parser events.
+
+    Works as an lxml parser target and is driven by the same calls from the
+    standard library parser, so a page is walked exactly once.
+    """
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.headings: List[str] = []
+        self.links: List[str] = []
+        self.metadata: Dict[str, str] = {}
+        self._buffer: List[str] = []
+        self._skip_depth = 0
+        self._heading_depth = 0
+        self._heading: List[str] = []
+        self._in_title = False
+        self._title: List[str] = []
+        self.blocks: List[TextBlock] = []
+        self._block: List[str] = []
+        self._block_links = 0
+        self._link_depth = 0
+        self._chrome_depth = 0
+
+    def _flush(self):
+        # Text is stripped per run between tags, like get_text(strip=True)
+        if not self._buffer:
+            return
+        text = "".join(self._buffer).strip()
+        self._buffer = []
+        if not text:
+            return
+        self.texts.append(text)
+        self._block.append(text)
+        if self._link_depth:
+            self._block_links += len(text)
+        if self._heading_depth:
+            self._heading.append(text)
+        if self._in_title:
+            self._title.append(text)
+
+    def _end_block(self):
+        if self._block:
+            self.blocks.append(TextBlock(
+                " ".join(self._block),
+                self._block_links,
+                heading=bool(self._heading_depth),
+                chrome=bool(self._chrome_depth)
+            ))
+            self._block = []
+            self._block_links = 0
+
+    def start(self, tag: str, attrib):
+        self._flush()
+        tag = tag.lower()
+        if tag in BLOCK_TAGS:
+            self._end_block()
+        if tag in CHROME_TAGS:
+            self._chrome_depth += 1
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "a":
+            self._link_depth += 1
+            href = attrib.get("href")
+            if href is not None:
+                self.links.append(href)
+        elif tag in HEADING_TAGS:
+            self._heading_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            name = (attrib.get("name") or attrib.get("property") or "").lower()
+            if name in META_NAMES and attrib.get("content"):
+                self.metadata.setdefault(name, attrib.get("content"))
+        elif tag == "link" and "canonical" in (attrib.get("rel") or "").lower():
+            self.metadata.setdefault("canonical", attrib.get("href") or "")
+        elif tag == "html" and attrib.get("lang"):
+            self.metadata["lang"] = attrib.get("lang")
+
+    def end(self, tag: str):
+        tag = tag.lower()
+        if tag in SKIPPED_TAGS:
+            self._buffer = []
+            self._skip_depth = max(self._skip_depth - 1, 0)
+            return
+        self._flush()
+        if tag in BLOCK_TAGS:
+            self._end_block()
+        if tag in CHROME_TAGS and self._chrome_depth:
+            self._chrome_depth -= 1
+        if tag == "a" and self._link_depth:
+            self._link_depth -= 1
+        elif tag in HEADING_TAGS and self._heading_depth:
+            self._heading_depth -= 1
+            if not self._heading_depth:
+                self.headings.append("".join(self._heading))
+                self._heading = []
+        elif tag == "title" and self._in_title:
+            self._in_title = False
+            self.metadata.setdefault("title", " ".join(self._title))
+
+    def data(self, data: str):
+        if not self._skip_depth:
+            self._buffer.append(data)
+
+    def comment(self, text: str):
+        self._flush()
+
+    def close(self) -> "_ExtractionTarget":
+        self._flush()
+        self._end_block()
+        return self
+
+
+class _StdlibParser(HTMLParser):
+    """Feeds html.parser events into an _ExtractionTarget."""
+
+    def __init__(self, target: _ExtractionTarget):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, {name: value or "" for name, value in attrs})
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+    def handle_comment(self, data):
+        self.target.comment(data)
+
+
+def extract(html: str, use_lxml: Optional[bool] = None) -> Dict:
+    """
+    Extract a page's text, headings, links and metadata in one parse.
+
+    Uses lxml's C parser with a streaming target when it is installed and
+    the standard library parser otherwise; both give the same result.
+
+    Args:
+        html: Page HTML
+        use_lxml: Force (True) or avoid (False) lxml; defaults to whatever is available
+
+    Returns:
+        Dict with "text" (stripped text runs joined by newlines), "headings",
+        "links", "metadata" and "blocks" (TextBlock per block-level element)
+    """
+    target = _ExtractionTarget()
+    if etree is not None and use_lxml is not False:
+        parser = etree.HTMLParser(target=target, remove_comments=False)
+        parser.feed(html)
+        parser.close()
+    else:
+        global _warned_fallback
+        if etree is None and not _warned_fallback:
+            _warned_fallback = True
+            logger.warning("lxml is not installed, extracting pages with the slower html.parser")
+        parser = _StdlibParser(target)
+        parser.feed(html)
+        parser.close()
+        target.close()
+    return {
+        "text": "\n".join(target.texts),
+        "headings": target.headings,
+        "links": target.links,
+        "metadata": target.metadata,
+        "blocks": target.blocks,
+    }
@@ -0,0 +1,126 @@
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from .browser_pool import BrowserPool
+
+# A page with less visible text than this is probably filled in by JavaScript
+MIN_TEXT_CHARS = 200
+
+# Markup left behind by client-rendered apps when JavaScript has not run
+SPA_MARKERS = re.compile(
+    r'<div[^>]+id="(?:root|app|__next|__nuxt)"[^>]*>\s*</div>'
+    r"|<app-root[^>]*>\s*</app-root>"
+    r"|(?:enable|requires?) javascript"
+    r"|window\.__INITIAL_STATE__",
+    re.IGNORECASE
+)
+_NON_TEXT = re.compile(r"<(script|style|noscript|template)\b.*?</\1>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<[^>]+>")
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+@dataclass
+class FetchResult:
+    """Plain HTTP fetch outcome; html is None when the browser must take over."""
+    url: str
+    html: Optional[str]
+    status: Optional[int]
+    fallback_reason: Optional[str] = None
+
+
+def js_shell_reason(html: str) -> Optional[str]:
+    """Why the HTML looks like it needs JavaScript to render, or None."""
+    marker = SPA_MARKERS.search(html)
+    text = " ".join(_TAG.sub(" ", _NON_TEXT.sub(" ", html)).split())
+    if len(text) < MIN_TEXT_CHARS:
+        return f"spa marker {marker.group(0)[:40]!r}" if marker else "little visible text"
+    return None
+
+
+class HttpFetcher:
+    """
+    Fetches pages over a pooled HTTP client before falling back to a browser.
+
+    The client runs on the browser pool's loop thread, so its connections
+    are reused across tool calls and it is closed with the pool.
+    """
+
+    def __init__(self, pool: BrowserPool, timeout: float = 10.0, max_connections: int = 20):
+        """
+        Args:
+            pool: Browser pool whose loop hosts the client
+            timeout: Seconds allowed per request
+            max_connections: Connections kept open across all hosts
+        """
+        self.logger = logging.getLogger(__name__)
+        self.pool = pool
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.paths = Counter()
+        self.fallback_reasons = Counter()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def fetch(self, url: str) -> FetchResult:
+        """Fetch the URL over HTTP and decide whether the HTML is usable as is."""
+        return await self.pool.call(self._fetch, url)
+
+    async def _fetch(self, url: str) -> FetchResult:
+        if not self._client:
+            self._client = httpx.AsyncClient(
+                headers=HEADERS,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_connections)
+            )
+            self.pool.on_close(self._close)
+        try:
+            response = await self._client.get(url)
+        except httpx.HTTPError as e:
+            return self._fallback(url, None, f"request failed: {type(e).__name__}")
+
+        content_type = response.headers.get("content-type", "")
+        if response.status_code != 200:
+            return self._fallback(url, response.status_code, f"HTTP {response.status_code}")
+        if "html" not in content_type:
+            return self._fallback(url, response.status_code, f"content type {content_type or 'missing'}")
+        reason = js_shell_reason(response.text)
+        if reason:
+            return self._fallback(url, response.status_code, reason)
+        self.paths["http"] += 1
+        return FetchResult(url, response.text, response.status_code)
+
+    def _fallback(self, url: str, status: Optional[int], reason: str) -> FetchResult:
+        self.paths["browser"] += 1
+        self.fallback_reasons[reason.split(" '")[0]] += 1
+        self.logger.info(f"Falling back to the browser for {url}: {reason}")
+        return FetchResult(url, None, status, reason)
+
+    async def _close(self):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+        self.logger.info(f"Fetch paths: {dict(self.paths)}, fallback reasons: {dict(self.fallback_reasons)}")
+
+
+_fetcher: Optional[HttpFetcher] = None
+
+
+def get_http_fetcher(pool: BrowserPool) -> HttpFetcher:
+    """Return the process-wide fetcher bound to the pool."""
+    global _fetcher
+    if not _fetcher or _fetcher.pool is not pool:
+        _fetcher = HttpFetcher(pool)
+    return _fetcher
@@ -1,32 +1,103 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+
 from crewai.tools import BaseTool
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup  # For processing the HTML content
+
+from .browser_pool import get_browser_pool
+from .content_ranker import CONTENT_BUDGET, select_content
+from .html_extractor import extract
+from .http_fetcher import get_http_fetcher
+
+# Defaults for batch mode; a task config can override both
+MAX_CONCURRENCY = 8
+PER_DOMAIN_CONCURRENCY = 2
+
+
+async def _load_html(page, url: str) -> str:
+    await page.goto(url, wait_until="networkidle")
+    return await page.content()
 
 class PlaywrightScraperTool(BaseTool):
     name: str = "Playwright Web Scraper"
-    description: str = "Scrapes content from a specified URL using Playwright."
+    description: str = (
+        "Scrapes content from a specified URL using Playwright. "
+        "Pass {\"urls\": [...]} instead of {\"url\": ...} to scrape many pages at once, "
+        "and {\"topic\": ...} to get back the page text most relevant to it."
+    )
 
     async def _run(self, task_config: dict) -> dict:
+        options = {
+            "force_browser": task_config.get("force_browser", False),
+            "topic": task_config.get("topic"),
+            "max_chars": task_config.get("max_chars", CONTENT_BUDGET),
+        }
+        urls = task_config.get("urls")
+        if urls:
+            return await self._scrape_many(
+                urls,
+                task_config.get("max_concurrency", MAX_CONCURRENCY),
+                task_config.get("per_domain", PER_DOMAIN_CONCURRENCY),
+                **options
+            )
+
         url = task_config.get("url")
         if not url:
             return {"error": "No URL provided in the task configuration."}
+        return await self._scrape(url, **options)
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.goto(url, wait_until="networkidle")
-            content = await page.content()
-            await browser.close()
+    async def _scrape(
+        self,
+        url: str,
+        force_browser: bool = False,
+        topic: str = None,
+        max_chars: int = CONTENT_BUDGET
+    ) -> dict:
+        pool = get_browser_pool()
+        fetched = None if force_browser else await get_http_fetcher(pool).fetch(url)
+        if fetched and fetched.html is not None:
+            content = fetched.html
+        else:
+            # Warm browsers are shared across calls instead of launching one per URL
+            content = await pool.run(lambda page: _load_html(page, url))
 
-        # Parse the content using BeautifulSoup
-        soup = BeautifulSoup(content, "html.parser")
-        main_content = soup.get_text(separator="\n", strip=True)
-        headings = [h.get_text(strip=True) for h in soup.find_all(["h1", "h2", "h3"])]
-        links = [a["href"] for a in soup.find_all("a", href=True)]
+        # Text, headings, links and metadata come out of a single parse
+        page = extract(content)
+        # The blocks most relevant to the topic, rather than whatever comes first
+        selected = select_content(page["blocks"], topic, max_chars, page["text"])
 
         return {
             "url": url,
-            "headings": headings,
-            "content": main_content[:2000],  # Truncate long content
-            "links": links,
+            "headings": page["headings"],
+            "content": selected.pop("content"),
+            "content_blocks": selected,
+            "links": page["links"],
+            "metadata": page["metadata"],
+            "fetched_with": "http" if fetched and fetched.html is not None else "browser",
+            "fallback_reason": fetched.fallback_reason if fetched else "forced",
+        }
+
+    async def _scrape_many(self, urls: list, max_concurrency: int, per_domain: int, **options) -> dict:
+        """Scrape URLs concurrently, returning results in input order."""
+        started = time.monotonic()
+        limit = asyncio.Semaphore(max_concurrency)
+        # One site is never hit with more than per_domain pages at once
+        domains = {}
+
+        async def scrape_one(url: str) -> dict:
+            domain = domains.setdefault(urlparse(url).netloc, asyncio.Semaphore(per_domain))
+            async with domain, limit:
+                url_started = time.monotonic()
+                try:
+                    result = {**await self._scrape(url, **options), "status": "success"}
+                except Exception as e:
+                    result = {"url": url, "status": "error", "error": str(e)}
+                result["elapsed"] = round(time.monotonic() - url_started, 2)
+                return result
+
+        results = await asyncio.gather(*(scrape_one(url) for url in urls))
+        return {
+            "results": list(results),
+            "succeeded": sum(1 for r in results if r["status"] == "success"),
+            "elapsed": round(time.monotonic() - started, 2),
         }
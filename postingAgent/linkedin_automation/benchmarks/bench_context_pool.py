@@ -0,0 +1,83 @@
+"""
+Benchmark BrowserContextPool leases, including leases cancelled mid-acquire.
+
+Times a cold acquire (browser launch and new context) and a warm one, then
+cancels acquire calls at several points while the browser is launching or
+the context is being created, the way a login task is cancelled when
+content generation fails first. After every cancellation the same user
+must be acquirable again within the timeout; the run fails if the user's
+lease was left locked.
+
+Usage:
+    python benchmarks/bench_context_pool.py [--delays 0,0.05,0.2,0.5] [--timeout 30]
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from browser_pool import BrowserContextPool
+
+
+async def timed_acquire(pool: BrowserContextPool, user_id: str) -> float:
+    started = time.perf_counter()
+    await pool.acquire(user_id)
+    pool.release(user_id)
+    return time.perf_counter() - started
+
+
+async def cancel_during_acquire(session_dir: str, delay: float, timeout: float) -> dict:
+    """Cancel a cold acquire after delay seconds, then acquire the same user again."""
+    pool = BrowserContextPool(session_dir, headless=True)
+    try:
+        task = asyncio.create_task(pool.acquire("alice"))
+        await asyncio.sleep(delay)
+        cancelled = not task.done()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        if not cancelled:
+            pool.release("alice")
+        try:
+            elapsed = await asyncio.wait_for(timed_acquire(pool, "alice"), timeout)
+        except asyncio.TimeoutError:
+            return {"delay": delay, "cancelled": cancelled, "recovered": False, "elapsed": timeout}
+        return {"delay": delay, "cancelled": cancelled, "recovered": True, "elapsed": elapsed}
+    finally:
+        await pool.close()
+
+
+async def run(delays, timeout: float) -> bool:
+    with tempfile.TemporaryDirectory() as session_dir:
+        pool = BrowserContextPool(session_dir, headless=True)
+        try:
+            cold = await timed_acquire(pool, "alice")
+            warm = await timed_acquire(pool, "alice")
+        finally:
+            await pool.close()
+        print(f"cold acquire {cold * 1000:7.1f}ms, warm acquire {warm * 1000:6.1f}ms")
+
+        ok = True
+        for delay in delays:
+            result = await cancel_during_acquire(session_dir, delay, timeout)
+            state = "cancelled mid-acquire" if result["cancelled"] else "finished before cancel"
+            outcome = f"re-acquired in {result['elapsed'] * 1000:7.1f}ms" if result["recovered"] else "STILL LOCKED"
+            print(f"cancel after {delay * 1000:5.0f}ms ({state}): {outcome}")
+            ok = ok and result["recovered"]
+        return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--delays", default="0,0.05,0.2,0.5", help="Comma-separated seconds to wait before cancelling")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds allowed for the follow-up acquire")
+    args = parser.parse_args()
+    delays = [float(d) for d in args.delays.split(",")]
+    sys.exit(0 if asyncio.run(run(delays, args.timeout)) else 1)
+
+
+if __name__ == "__main__":
+    main()
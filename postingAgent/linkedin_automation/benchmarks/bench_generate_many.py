@@ -0,0 +1,107 @@
+"""
+Benchmark ContentGenerator.generate_many against a local fake LLM.
+
+Starts an OpenAI-compatible chat completions server that answers every
+request after a fixed delay. The crews are pointed at it and the benchmark
+reports throughput as concurrency grows, with and without a rate limiter.
+
+Usage:
+    python benchmarks/bench_generate_many.py [--topics 16] [--latency 0.5] [--rpm 0]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+FAKE_POST = (
+    "Thought: I now can give a great answer\\n"
+    "Final Answer: AI agents are changing how teams work.\\n\\n"
+    "What would you automate first?\\n\\n#AI #Automation #FutureOfWork"
+)
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    latency = 0.5
+    requests = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with FakeLLMHandler.lock:
+            FakeLLMHandler.requests += 1
+        time.sleep(self.latency)
+        body = json.dumps({
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-4",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.loads(f'"{FAKE_POST}"')},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 600, "completion_tokens": 200, "total_tokens": 800}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def measure(generator, topics, concurrency, limiter) -> float:
+    started = time.perf_counter()
+    async for result in generator.generate_many(
+        topics, max_concurrency=concurrency, rate_limiter=limiter, use_cache=False
+    ):
+        if result["status"] != "success":
+            raise RuntimeError(result.get("error"))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--topics", type=int, default=16, help="Number of topics per run")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds the fake LLM takes per request")
+    parser.add_argument("--rpm", type=float, default=0, help="Requests-per-minute quota to enforce (0 disables the limiter)")
+    args = parser.parse_args()
+
+    FakeLLMHandler.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.update({
+        "OPENAI_API_KEY": "sk-bench",
+        "OPENAI_API_BASE": base_url,
+        "OPENAI_BASE_URL": base_url,
+    })
+
+    from content_generator import ContentGenerator
+    from rate_limiter import OpenAIRateLimiter
+
+    generator = ContentGenerator()
+    topics = [f"Benchmark topic {i}" for i in range(args.topics)]
+    print(f"{args.topics} topics, fake LLM latency {args.latency}s")
+    for concurrency in (1, 2, 4, 8, 16):
+        limiter = OpenAIRateLimiter(requests_per_minute=args.rpm, tokens_per_minute=10**9) if args.rpm else None
+        FakeLLMHandler.requests = 0
+        elapsed = asyncio.run(measure(generator, topics, concurrency, limiter))
+        print(
+            f"concurrency {concurrency:>2}: {elapsed:6.2f}s, "
+            f"{args.topics / elapsed * 60:7.1f} topics/min, {FakeLLMHandler.requests} LLM requests"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark the local post cleaner over a corpus of raw writer outputs.
+
+First checks a set of golden input/output pairs covering each cleaning
+rule, then times clean_post over a synthetic corpus built from the same
+artifacts the crews produce (markdown, JSON wrappers, hashtag headers,
+'hashtag#' prefixes, overlong posts).
+
+Usage:
+    python benchmarks/bench_post_cleaner.py [--posts 5000]
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from post_cleaner import LINKEDIN_MAX_CHARS, clean_post
+
+GOLDEN = [
+    (
+        "**Bold** and *italic* and __underlined__ text",
+        "Bold and italic and underlined text",
+    ),
+    (
+        "## Heading\n\nBody line",
+        "Heading\n\nBody line",
+    ),
+    (
+        "Intro\n\n- one\n* two\n+ three",
+        "Intro\n\n• one\n• two\n• three",
+    ),
+    (
+        "Great post\n\nRelevant Hashtags:\nhashtag#AI hashtag#Automation",
+        "Great post\n\n#AI #Automation",
+    ),
+    (
+        "Great post\n\nHashtags: #AI #ai #Tech",
+        "Great post\n\n#AI #Tech",
+    ),
+    (
+        "Post\n\n#A #B #C #D #E #F #G",
+        "Post\n\n#A #B #C #D #E",
+    ),
+    (
+        '```json\n{"post_content": "Hello **world**", "hashtags": ["AI", "#ML"]}\n```',
+        "Hello world\n\n#AI #ML",
+    ),
+    (
+        "Line one   \n\n\n\nLine two",
+        "Line one\n\nLine two",
+    ),
+    (
+        "Read [the report](https://example.com/r) and run `make`",
+        "Read the report (https://example.com/r) and run make",
+    ),
+    (
+        "Keep snake_case and 2*3 as they are",
+        "Keep snake_case and 2*3 as they are",
+    ),
+    (
+        'As Jobs said, "Stay hungry, stay foolish"\nNext line, with a comma,\nLast line',
+        'As Jobs said, "Stay hungry, stay foolish"\nNext line, with a comma,\nLast line',
+    ),
+    (
+        'post_content: "Hello world",\nhashtags: ["#AI", "#ML"]',
+        "Hello world\n\n#AI #ML",
+    ),
+]
+
+FRAGMENTS = [
+    "🚀 **{topic} is changing everything.**",
+    "## Why {topic} matters",
+    "Most teams still treat {topic} as an experiment. The leaders treat it as *infrastructure*.",
+    "- Faster decisions\n- Fewer handoffs\n- [Better data](https://example.com/{n})",
+    "What is your team doing about {topic}? Share below 👇",
+    "Relevant Hashtags:\nhashtag#{tag} hashtag#Innovation #Leadership #{tag}",
+]
+
+
+def build_corpus(size: int):
+    rng = random.Random(7)
+    corpus = []
+    for n in range(size):
+        topic = rng.choice(["AI agents", "crowdfunding", "remote work", "supply chains"])
+        tag = topic.title().replace(" ", "")
+        body = "\n\n".join(f.format(topic=topic, tag=tag, n=n) for f in FRAGMENTS)
+        if n % 5 == 0:
+            body = "```json\n" + json.dumps({"post_content": body, "hashtags": [tag, "AI"]}) + "\n```"
+        if n % 11 == 0:
+            body = body * 12
+        corpus.append(body)
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=5000, help="Number of posts in the corpus")
+    args = parser.parse_args()
+
+    failures = 0
+    for raw, expected in GOLDEN:
+        actual = clean_post(raw)
+        if actual != expected:
+            failures += 1
+            print(f"GOLDEN MISMATCH\n  input:    {raw!r}\n  expected: {expected!r}\n  actual:   {actual!r}")
+    print(f"golden: {len(GOLDEN) - failures}/{len(GOLDEN)} passed")
+
+    corpus = build_corpus(args.posts)
+    timings = []
+    for raw in corpus:
+        started = time.perf_counter()
+        cleaned = clean_post(raw)
+        timings.append(time.perf_counter() - started)
+        assert len(cleaned) <= LINKEDIN_MAX_CHARS
+        assert "**" not in cleaned and "hashtag#" not in cleaned
+
+    chars = sum(len(raw) for raw in corpus)
+    print(
+        f"{len(corpus)} posts, {chars / len(corpus):.0f} chars on average: "
+        f"median {statistics.median(timings) * 1e6:.1f}us, "
+        f"p99 {sorted(timings)[int(len(timings) * 0.99)] * 1e6:.1f}us, "
+        f"{len(corpus) / sum(timings):,.0f} posts/s"
+    )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
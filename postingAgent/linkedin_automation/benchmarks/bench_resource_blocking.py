@@ -0,0 +1,127 @@
+"""
+Benchmark request blocking against a local fixture feed page.
+
+Serves a page that only reveals its share box after the load event, along
+with heavy images, fonts, a video and a tracker script on a denylisted host,
+then reports bytes transferred and time-to-share-box with and without the
+ResourceBlocker.
+
+Usage:
+    python benchmarks/bench_resource_blocking.py [--runs 5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from playwright.async_api import async_playwright
+from resource_blocker import ResourceBlocker
+
+ASSETS = {
+    "/img/{}.png": ("image/png", 400_000, 12),
+    "/fonts/{}.woff2": ("font/woff2", 120_000, 4),
+    "/media/{}.mp4": ("video/mp4", 2_000_000, 1),
+}
+# The tracker is served from 127.0.0.1 while the page is on localhost,
+# so the domain denylist can be exercised without leaving the machine
+TRACKER_HOST = "127.0.0.1"
+
+
+def build_page(port: int) -> bytes:
+    parts = ["<html><head><style>"]
+    for i in range(ASSETS["/fonts/{}.woff2"][2]):
+        parts.append(f"@font-face{{font-family:f{i};src:url(/fonts/{i}.woff2)}} body{{font-family:f{i}}}")
+    parts.append("</style>")
+    parts.append(f'<script src="http://{TRACKER_HOST}:{port}/tracker.js"></script></head><body>')
+    for i in range(ASSETS["/img/{}.png"][2]):
+        parts.append(f'<img src="/img/{i}.png">')
+    parts.append('<video src="/media/0.mp4" preload="auto"></video>')
+    parts.append("""<script>
+        window.addEventListener('load', () => {
+            const box = document.createElement('div');
+            box.className = 'share-box-feed-entry__trigger';
+            document.body.appendChild(box);
+        });
+    </script></body></html>""")
+    return "".join(parts).encode()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    bytes_sent = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/feed/":
+            body, content_type = build_page(self.server.server_port), "text/html"
+        elif path == "/tracker.js":
+            body, content_type = b"/*" + b"x" * 80_000 + b"*/", "application/javascript"
+        else:
+            for pattern, (content_type, size, _) in ASSETS.items():
+                prefix = pattern.split("{}")[0]
+                if path.startswith(prefix):
+                    body = os.urandom(size)
+                    break
+            else:
+                self.send_error(404)
+                return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+        with FixtureHandler.lock:
+            FixtureHandler.bytes_sent += len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def measure(browser, url: str, blocker) -> tuple:
+    context = await browser.new_context()
+    if blocker:
+        await blocker.install(context)
+    page = await context.new_page()
+    FixtureHandler.bytes_sent = 0
+    started = time.perf_counter()
+    await page.goto(url, wait_until="commit")
+    await page.wait_for_selector('div[class*="share-box-feed-entry"]', state="attached", timeout=60000)
+    elapsed = time.perf_counter() - started
+    await context.close()
+    return elapsed, FixtureHandler.bytes_sent
+
+
+async def run(runs: int):
+    server = ThreadingHTTPServer(("0.0.0.0", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://localhost:{server.server_port}/feed/"
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        for label, blocker in (
+            ("no blocking", None),
+            ("blocking", ResourceBlocker(blocked_domains=[TRACKER_HOST])),
+        ):
+            samples = [await measure(browser, url, blocker) for _ in range(runs)]
+            times = [s[0] for s in samples]
+            transferred = [s[1] for s in samples]
+            print(
+                f"{label:>12}: time-to-share-box median {statistics.median(times) * 1000:7.1f}ms, "
+                f"bytes transferred median {statistics.median(transferred) / 1024:8.1f}KiB"
+            )
+        await browser.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Page loads per configuration")
+    asyncio.run(run(parser.parse_args().runs))
@@ -0,0 +1,208 @@
+from playwright.async_api import async_playwright
+from collections import OrderedDict
+from dataclasses import dataclass
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+from resource_blocker import ResourceBlocker
+
+DEFAULT_CONTEXT_OPTIONS = {
+    "viewport": {'width': 1920, 'height': 1080},
+    "user_agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
+
+@dataclass
+class PooledContext:
+    """A browser context kept warm for a single LinkedIn account."""
+    user_id: str
+    context: object
+    page: object
+    has_session: bool = False
+
+
+class BrowserContextPool:
+    def __init__(
+        self,
+        session_dir: str,
+        max_contexts: int = 5,
+        headless: bool = False,
+        resource_blocker: Optional[ResourceBlocker] = None
+    ):
+        """
+        Initialize a pool of long-lived browser contexts keyed by user ID.
+
+        Args:
+            session_dir: Directory where each user's storage_state is persisted
+            max_contexts: Maximum number of contexts kept open at once
+            headless: Whether to launch Chromium headless
+            resource_blocker: Optional filter installed on every new context
+                to drop images, fonts, media and trackers
+        """
+        self.logger = logging.getLogger(__name__)
+        self.session_dir = Path(session_dir)
+        self.max_contexts = max_contexts
+        self.headless = headless
+        self.resource_blocker = resource_blocker
+        self.playwright = None
+        self.browser = None
+        self._entries: "OrderedDict[str, PooledContext]" = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._user_locks: Dict[str, asyncio.Lock] = {}
+        self.metrics = {"hits": 0, "misses": 0, "evictions": 0, "expired_sessions": 0}
+
+    def _session_path(self, user_id: str) -> Path:
+        """Return the storage_state file for a user."""
+        return self.session_dir / f"{user_id}.json"
+
+    async def _ensure_browser(self):
+        """Launch the shared browser on first use."""
+        if self.browser and self.browser.is_connected():
+            return
+        if not self.playwright:
+            self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        # Contexts from a dead browser are unusable
+        self._entries.clear()
+
+    async def acquire(self, user_id: str) -> PooledContext:
+        """
+        Get a warm context for the user, creating one if needed.
+
+        Each user's context is leased to one caller at a time; concurrent
+        callers for the same user wait until it is released.
+
+        Args:
+            user_id: ID of the user from the credentials file
+
+        Returns:
+            PooledContext with an open page; has_session is True when the
+            context carries cookies from a previous login
+        """
+        user_lock = self._user_locks.setdefault(user_id, asyncio.Lock())
+        await user_lock.acquire()
+        try:
+            return await self._get_or_create(user_id)
+        except BaseException:
+            # Also on cancellation, e.g. a login abandoned during the first browser launch
+            user_lock.release()
+            raise
+
+    def release(self, user_id: str):
+        """Return a leased context to the pool."""
+        user_lock = self._user_locks.get(user_id)
+        if user_lock and user_lock.locked():
+            user_lock.release()
+
+    def _in_use(self, user_id: str) -> bool:
+        user_lock = self._user_locks.get(user_id)
+        return bool(user_lock and user_lock.locked())
+
+    async def _get_or_create(self, user_id: str) -> PooledContext:
+        async with self._lock:
+            await self._ensure_browser()
+
+            entry = self._entries.get(user_id)
+            if entry and not entry.page.is_closed():
+                self._entries.move_to_end(user_id)
+                self.metrics["hits"] += 1
+                self.logger.info(f"Browser pool hit for user {user_id}")
+                return entry
+
+            self.metrics["misses"] += 1
+            self.logger.info(f"Browser pool miss for user {user_id}")
+            if entry:
+                await self._close_entry(entry)
+                del self._entries[user_id]
+
+            # Least recently used first; contexts leased to other jobs are never evicted
+            idle = [uid for uid in self._entries if not self._in_use(uid)]
+            while len(self._entries) >= self.max_contexts and idle:
+                oldest = self._entries.pop(idle.pop(0))
+                await self._close_entry(oldest)
+                self.metrics["evictions"] += 1
+                self.logger.info(f"Evicted browser context for user {oldest.user_id}")
+
+            session_path = self._session_path(user_id)
+            options = dict(DEFAULT_CONTEXT_OPTIONS)
+            if session_path.exists():
+                options["storage_state"] = str(session_path)
+
+            context = await self.browser.new_context(**options)
+            await context.add_init_script(STEALTH_SCRIPT)
+            if self.resource_blocker:
+                await self.resource_blocker.install(context)
+            page = await context.new_page()
+
+            entry = PooledContext(
+                user_id=user_id,
+                context=context,
+                page=page,
+                has_session="storage_state" in options
+            )
+            self._entries[user_id] = entry
+            return entry
+
+    async def save_session(self, user_id: str):
+        """Persist the user's cookies and local storage to disk."""
+        entry = self._entries.get(user_id)
+        if not entry:
+            return
+        try:
+            self.session_dir.mkdir(parents=True, exist_ok=True)
+            await entry.context.storage_state(path=str(self._session_path(user_id)))
+            entry.has_session = True
+        except Exception as e:
+            self.logger.error(f"Error saving session for user {user_id}: {str(e)}")
+
+    async def expire_session(self, user_id: str):
+        """Forget a saved session that LinkedIn no longer accepts."""
+        self.metrics["expired_sessions"] += 1
+        self._session_path(user_id).unlink(missing_ok=True)
+        entry = self._entries.get(user_id)
+        if entry:
+            entry.has_session = False
+            await entry.context.clear_cookies()
+
+    async def _close_entry(self, entry: PooledContext):
+        """Save and close a pooled context."""
+        try:
+            if entry.has_session:
+                self.session_dir.mkdir(parents=True, exist_ok=True)
+                await entry.context.storage_state(path=str(self._session_path(entry.user_id)))
+            await entry.context.close()
+        except Exception as e:
+            self.logger.error(f"Error closing context for user {entry.user_id}: {str(e)}")
+
+    def stats(self) -> Dict:
+        """Return pool metrics along with the current size."""
+        stats = {**self.metrics, "open_contexts": len(self._entries)}
+        if self.resource_blocker:
+            stats["blocked_requests"] = self.resource_blocker.blocked
+        return stats
+
+    async def close(self):
+        """Close every context, the browser and Playwright."""
+        async with self._lock:
+            for entry in list(self._entries.values()):
+                await self._close_entry(entry)
+            self._entries.clear()
+            try:
+                if self.browser:
+                    await self.browser.close()
+                if self.playwright:
+                    await self.playwright.stop()
+            except Exception as e:
+                self.logger.error(f"Error closing browser pool: {str(e)}")
+            finally:
+                self.browser = None
+                self.playwright = None
+            self.logger.info(f"Browser pool stats: {self.stats()}")
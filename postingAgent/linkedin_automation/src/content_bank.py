@@ -0,0 +1,161 @@
+import asyncio
+import heapq
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+class ContentBank:
+    def __init__(
+        self,
+        generator,
+        capacity: int = 2,
+        low_water_mark: int = 1,
+        max_age_seconds: float = 12 * 3600,
+        lead_time_seconds: float = 2 * 3600,
+        refill_concurrency: int = 2,
+        retry_seconds: float = 300,
+        fast: bool = False
+    ):
+        """
+        Initialize a bank of pre-generated posts per (account, topic).
+
+        A background producer keeps a queue of cleaned posts for every
+        registered post that is due within lead_time_seconds, so the poster
+        only has to dequeue at posting time.
+
+        Args:
+            generator: ContentGenerator used to fill the queues
+            capacity: Maximum posts kept per (account, topic)
+            low_water_mark: Refill once a queue holds this many posts or fewer
+            max_age_seconds: Posts older than this are discarded as stale
+            lead_time_seconds: How long before a post is needed to start
+                filling its queue
+            refill_concurrency: Maximum generations running at once
+            retry_seconds: Wait before retrying a failed generation
+            fast: Use the generator's single-call fast mode
+        """
+        self.logger = logging.getLogger(__name__)
+        self.generator = generator
+        self.capacity = capacity
+        self.low_water_mark = low_water_mark
+        self.max_age_seconds = max_age_seconds
+        self.lead_time_seconds = lead_time_seconds
+        self.retry_seconds = retry_seconds
+        self.fast = fast
+        self._queues: Dict[Tuple[str, str], deque] = {}
+        self._due: Dict[Tuple[str, str], List[float]] = {}
+        self._filling: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(refill_concurrency)
+        self._wakeup = asyncio.Event()
+        self.stats = {"served": 0, "empty": 0, "stale": 0, "generated": 0}
+
+    def register(self, user_id: str, topic: str, needed_at: Optional[float] = None):
+        """
+        Ask the producer to have a post ready for an account and topic.
+
+        Args:
+            user_id: ID of the user who will post
+            topic: Topic of the post
+            needed_at: Unix time the post is due; filling starts
+                lead_time_seconds before. Defaults to now.
+        """
+        key = (user_id, topic)
+        self._queues.setdefault(key, deque())
+        heapq.heappush(self._due.setdefault(key, []), needed_at or time.time())
+        self._wakeup.set()
+
+    def take(self, user_id: str, topic: str) -> Optional[Dict]:
+        """
+        Dequeue the oldest fresh post for an account and topic.
+
+        Returns:
+            A generation result dict, or None if nothing fresh is banked
+        """
+        key = (user_id, topic)
+        queue = self._queues.get(key)
+        if self._due.get(key):
+            heapq.heappop(self._due[key])
+        result = None
+        while queue:
+            banked_at, item = queue.popleft()
+            if time.time() - banked_at <= self.max_age_seconds:
+                result = item
+                break
+            self.stats["stale"] += 1
+        self.stats["served" if result else "empty"] += 1
+        if queue is not None:
+            self._wakeup.set()
+        return result
+
+    def level(self, user_id: str, topic: str) -> int:
+        """Number of banked posts for an account and topic."""
+        return len(self._queues.get((user_id, topic), ()))
+
+    def _target(self, key: Tuple[str, str], now: float) -> int:
+        """Posts worth holding now: one per registration due within the lead time."""
+        horizon = now + self.lead_time_seconds
+        return min(self.capacity, sum(1 for due in self._due.get(key, ()) if due <= horizon))
+
+    def _needs_refill(self, key: Tuple[str, str], now: float) -> bool:
+        due = self._due[key]
+        # Registrations nobody came to collect, e.g. cancelled jobs
+        while due and due[0] < now - self.max_age_seconds:
+            heapq.heappop(due)
+        queue = self._queues[key]
+        while queue and now - queue[0][0] > self.max_age_seconds:
+            queue.popleft()
+            self.stats["stale"] += 1
+        return (
+            key not in self._filling
+            and len(queue) <= self.low_water_mark
+            and len(queue) < self._target(key, now)
+        )
+
+    async def _fill(self, key: Tuple[str, str]):
+        """Generate posts until the queue reaches its target."""
+        user_id, topic = key
+        try:
+            while len(self._queues[key]) < self._target(key, time.time()):
+                async with self._semaphore:
+                    # Each banked post must be distinct, so never serve them from the cache
+                    result = await asyncio.to_thread(
+                        self.generator.generate_content, topic, None, False, self.fast
+                    )
+                if result["status"] != "success":
+                    self.logger.error(f"Content bank refill failed for {user_id}/{topic}: {result.get('error')}")
+                    await asyncio.sleep(self.retry_seconds)
+                    continue
+                self._queues[key].append((time.time(), result))
+                self.stats["generated"] += 1
+                self.logger.info(f"Banked post for {user_id}/{topic} ({len(self._queues[key])}/{self.capacity})")
+        finally:
+            del self._filling[key]
+
+    async def run(self):
+        """Keep registered queues topped up until cancelled."""
+        try:
+            while True:
+                self._wakeup.clear()
+                now = time.time()
+                next_check = now + self.max_age_seconds
+                for key in list(self._queues):
+                    if self._needs_refill(key, now):
+                        self._filling[key] = asyncio.create_task(self._fill(key))
+                    elif self._due[key]:
+                        upcoming = [due for due in self._due[key] if due > now + self.lead_time_seconds]
+                        if upcoming:
+                            next_check = min(next_check, min(upcoming) - self.lead_time_seconds)
+                    if self._queues[key]:
+                        next_check = min(next_check, self._queues[key][0][0] + self.max_age_seconds)
+                # asyncio.wait rather than wait_for: on Python 3.10/3.11 wait_for can
+                # swallow a cancel that lands just as the event is set
+                waiter = asyncio.ensure_future(self._wakeup.wait())
+                try:
+                    await asyncio.wait({waiter}, timeout=max(next_check - time.time(), 1))
+                finally:
+                    waiter.cancel()
+        finally:
+            for task in list(self._filling.values()):
+                task.cancel()
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    latency REAL NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def normalize_topic(topic: str) -> str:
+    """Collapse case and whitespace so trivially different topics share a key."""
+    return " ".join(topic.lower().split())
+
+
+def cache_key(
+    topic: str,
+    additional_context: Optional[Dict],
+    prompt_version: str,
+    model: str,
+    mode: str = "crew"
+) -> str:
+    """Hash everything that changes what the LLM would produce."""
+    payload = json.dumps(
+        {
+            "topic": normalize_topic(topic),
+            "context": additional_context or {},
+            "prompt_version": prompt_version,
+            "model": model,
+            "mode": mode,
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ContentCache:
+    def __init__(self, db_path: str, ttl_seconds: float = 6 * 3600, max_entries: int = 500):
+        """
+        Initialize a disk-backed LRU cache of generation results.
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl_seconds: Age after which an entry is no longer served
+            max_entries: Entries kept before the least recently used are evicted
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # Generation runs in worker threads, so share one connection under a lock
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.db.execute(SCHEMA)
+        self.db.commit()
+        self.hits = 0
+        self.misses = 0
+        self.saved_latency = 0.0
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Return a fresh cached result, or None on a miss.
+
+        The returned dict has the cached "result" and the "latency" the
+        original generation took.
+        """
+        now = time.time()
+        with self._lock:
+            row = self.db.execute(
+                "SELECT result, latency, created_at FROM generations WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[2] <= self.ttl_seconds:
+                self.db.execute("UPDATE generations SET last_used = ? WHERE key = ?", (now, key))
+                self.db.commit()
+                self.hits += 1
+                self.saved_latency += row[1]
+                return {"result": json.loads(row[0]), "latency": row[1]}
+            if row:
+                self.db.execute("DELETE FROM generations WHERE key = ?", (key,))
+                self.db.commit()
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: Dict, latency: float):
+        """Store a result and evict expired and least recently used entries."""
+        now = time.time()
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO generations (key, result, latency, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(result, default=str), latency, now, now)
+            )
+            self.db.execute("DELETE FROM generations WHERE created_at < ?", (now - self.ttl_seconds,))
+            self.db.execute(
+                "DELETE FROM generations WHERE key NOT IN "
+                "(SELECT key FROM generations ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self.db.commit()
+
+    def stats(self) -> Dict:
+        """Return hit rate and LLM time saved so far."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "saved_latency_seconds": round(self.saved_latency, 2),
+        }
+
+    def close(self):
+        """Close the cache database."""
+        self.db.close()
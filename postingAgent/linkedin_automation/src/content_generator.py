@@ -1,40 +1,173 @@
 from crewai import Agent, Task, Crew
+from openai import AsyncOpenAI, OpenAI
 from textwrap import dedent
+import asyncio
+import json
 import logging
-from typing import Dict, List, Optional
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime
 
+from content_cache import ContentCache, cache_key
+from context_packer import ContextPacker
+from post_cleaner import clean_post
+from rate_limiter import OpenAIRateLimiter
+from variant_ranker import rank_variants
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Bump whenever agents or task prompts change so cached results are not reused
+PROMPT_VERSION = "3"
+
+# Rough budget of tokens across all LLM calls of one generation
+ESTIMATED_TOKENS_PER_GENERATION = 3000
+
+FAST_MODE_SYSTEM_PROMPT = dedent("""
+    You are a LinkedIn content strategist and copywriter for a B2B audience.
+    For the given topic, first decide on the angle, audience and key message,
+    then write the post. The post needs an attention-grabbing opening, key
+    points or insights and a call to action. Keep it concise, use emojis
+    sparingly, use line breaks for readability and no markdown.
+
+    Reply with only a JSON object with these keys:
+    "body": the post text without hashtags,
+    "hashtags": a list of 3-5 relevant hashtags,
+    "suggested_time": the best weekday and local time to post, e.g. "Tuesday 09:00"
+""").strip()
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+# Shared by the crew tasks and the streaming API so both use the same prompts
+STRATEGY_PROMPT = dedent("""
+    Create a content strategy for a LinkedIn post about {topic}.
+    Focus on making it engaging and professional.
+    Consider the target audience and key messages.
+""").strip()
+
+WRITING_PROMPT = dedent("""
+    Write an engaging LinkedIn post about {topic}.
+    Make it professional, engaging, and include:
+    - An attention-grabbing opening
+    - Key points or insights
+    - A call to action
+    - 3-5 relevant hashtags at the end
+    Keep it concise and use appropriate emojis sparingly.
+    Format with proper line breaks for readability.
+""").strip()
+
+STRATEGIST_PROFILE = {
+    "role": "Content Strategist",
+    "goal": "Develop engaging LinkedIn content strategies",
+    "backstory": dedent("""
+        Expert in social media strategy with deep understanding of 
+        LinkedIn's professional audience and content performance metrics.
+        Specialized in B2B content and thought leadership.
+    """),
+}
+
+WRITER_PROFILE = {
+    "role": "Content Writer",
+    "goal": "Create compelling LinkedIn posts",
+    "backstory": dedent("""
+        Professional copywriter with expertise in creating viral LinkedIn 
+        content. Skilled in storytelling, building engagement, and 
+        crafting hooks that capture attention.
+    """),
+}
+
+
+def _system_prompt(profile: Dict) -> str:
+    """Describe an agent profile the way a crew agent is prompted."""
+    return f"You are {profile['role']}. {profile['backstory'].strip()}\nYour personal goal is: {profile['goal']}"
+
+@dataclass
+class GeneratedPost:
+    """Structured output of fast mode."""
+    body: str
+    hashtags: List[str] = field(default_factory=list)
+    suggested_time: Optional[str] = None
+
+    @classmethod
+    def from_llm_output(cls, text: str) -> "GeneratedPost":
+        """Parse the model's JSON reply, treating unparseable output as the body."""
+        match = _JSON_OBJECT.search(text or "")
+        try:
+            data = json.loads(match.group(0)) if match else {}
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict) or not data.get("body"):
+            return cls(body=text or "")
+        hashtags = data.get("hashtags") or []
+        if isinstance(hashtags, str):
+            hashtags = hashtags.split()
+        return cls(
+            body=clean_post(str(data["body"]), max_hashtags=0),
+            hashtags=[f"#{str(tag).lstrip('#')}" for tag in hashtags],
+            suggested_time=data.get("suggested_time")
+        )
+
+    def to_post(self) -> str:
+        """Render the ready-to-post text."""
+        return clean_post(f"{self.body}\n\n{' '.join(self.hashtags)}")
+
+@dataclass
+class StreamEvent:
+    """One chunk of streamed output, tagged with the stage that produced it."""
+    stage: str
+    text: str
+    final: bool = False
+    result: Optional[Dict] = None
+
 class ContentGenerator:
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ContentCache] = None,
+        model: Optional[str] = None,
+        use_llm_cleaner: bool = False,
+        context_packer: Optional[ContextPacker] = None
+    ):
+        """
+        Initialize the content generator.
+
+        Args:
+            cache: Optional cache of previous results, shared across accounts
+            model: Model name the agents use; part of the cache key
+            use_llm_cleaner: Run the Content Cleaner agent instead of only the
+                local post cleaner
+            context_packer: Fits additional_context into each prompt's token
+                budget; defaults to ContextPacker()
+        """
         self.logger = logging.getLogger(__name__)
+        self.cache = cache
+        self.model = model or os.environ.get("OPENAI_MODEL_NAME", "gpt-4")
+        self.use_llm_cleaner = use_llm_cleaner
+        self.mode = "crew-llm-cleaner" if use_llm_cleaner else "crew"
+        # One LLM call per task in the crew
+        self.llm_calls = 3 if use_llm_cleaner else 2
+        self.mode_stats: Dict[str, Dict] = {}
+        self._stats_lock = threading.Lock()
+        self.context_packer = context_packer or ContextPacker()
+        self._client = None
+        self._async_client = None
     
     def create_agents(self) -> tuple[Agent, Agent, Agent]:
         """Create and return the specialized agents for content creation."""
         content_strategist = Agent(
-            role='Content Strategist',
-            goal='Develop engaging LinkedIn content strategies',
-            backstory=dedent("""
-                Expert in social media strategy with deep understanding of 
-                LinkedIn's professional audience and content performance metrics.
-                Specialized in B2B content and thought leadership.
-            """),
+            **STRATEGIST_PROFILE,
             allow_delegation=False,
             verbose=True
         )
 
         content_writer = Agent(
-            role='Content Writer',
-            goal='Create compelling LinkedIn posts',
-            backstory=dedent("""
-                Professional copywriter with expertise in creating viral LinkedIn 
-                content. Skilled in storytelling, building engagement, and 
-                crafting hooks that capture attention.
-            """),
+            **WRITER_PROFILE,
             allow_delegation=False,
             verbose=True
         )
@@ -63,26 +196,13 @@ class ContentGenerator:
     ) -> List[Task]:
         """Create tasks for content generation with optional context."""
         strategy_task = Task(
-            description=f"""
-                Create a content strategy for a LinkedIn post about {topic}.
-                Focus on making it engaging and professional.
-                Consider the target audience and key messages.
-            """,
+            description=self._stage_prompt("strategy", topic, additional_context),
             expected_output="A content strategy for the LinkedIn post",
             agent=content_strategist
         )
 
         writing_task = Task(
-            description=f"""
-                Write an engaging LinkedIn post about {topic}.
-                Make it professional, engaging, and include:
-                - An attention-grabbing opening
-                - Key points or insights
-                - A call to action
-                - 3-5 relevant hashtags at the end
-                Keep it concise and use appropriate emojis sparingly.
-                Format with proper line breaks for readability.
-            """,
+            description=self._stage_prompt("writing", topic, additional_context),
             expected_output="A complete LinkedIn post with hashtags",
             agent=content_writer
         )
@@ -109,10 +229,19 @@ class ContentGenerator:
 
         return [strategy_task, writing_task, cleaning_task]
 
+    def _stage_prompt(self, stage: str, topic: str, additional_context: Optional[Dict]) -> str:
+        """Build a stage's prompt with as much additional context as its budget allows."""
+        prompts = {"strategy": STRATEGY_PROMPT, "writing": WRITING_PROMPT, "fast": "Topic: {topic}"}
+        prompt = prompts[stage].format(topic=topic)
+        packed = self.context_packer.pack(additional_context, topic, stage)
+        return f"{prompt}\n\n{packed}" if packed else prompt
+
     def generate_content(
         self, 
         topic: str, 
-        additional_context: Optional[Dict] = None
+        additional_context: Optional[Dict] = None,
+        use_cache: bool = True,
+        fast: bool = False
     ) -> Dict:
         """
         Generate LinkedIn content for the given topic.
@@ -120,40 +249,44 @@ class ContentGenerator:
         Args:
             topic: The main topic for the post
             additional_context: Optional dictionary with additional context
+            use_cache: If False, always run the crew and skip the cache
+            fast: Produce the post in one structured LLM call instead of
+                running the crew
             
         Returns:
             Dict containing the generated content and metadata
         """
+        mode = "fast" if fast else self.mode
+        key = cache_key(topic, additional_context, PROMPT_VERSION, self.model, mode)
+        if use_cache:
+            cached = self._cached_result(topic, additional_context, mode)
+            if cached:
+                return cached
+
         try:
-            self.logger.info(f"Starting content generation for topic: {topic}")
-            
-            content_strategist, content_writer, content_cleaner = self.create_agents()
-            
-            tasks = self.create_tasks(
-                content_strategist, 
-                content_writer, 
-                content_cleaner, 
-                topic,
-                additional_context
-            )
-            
-            crew = Crew(
-                agents=[content_strategist, content_writer, content_cleaner],
-                tasks=tasks,
-                verbose=True
-            )
-            
-            result = crew.kickoff()
+            self.logger.info(f"Starting {mode} content generation for topic: {topic}")
+            started = time.monotonic()
+
+            if fast:
+                generated = self._generate_fast(topic, additional_context)
+            else:
+                generated = self._generate_with_crew(topic, additional_context)
+            latency = time.monotonic() - started
+            self._record_run(mode, latency, generated["usage"])
             
             self.logger.info("Content generation completed successfully")
             
             # Add metadata to the result
-            return {
-                "content": result,
+            generated.update({
                 "generated_at": datetime.now().isoformat(),
                 "topic": topic,
-                "status": "success"
-            }
+                "status": "success",
+                "mode": mode,
+                "latency_seconds": round(latency, 2)
+            })
+            if self.cache:
+                self.cache.put(key, generated, latency)
+            return {**generated, "cache": {"hit": False, **self._cache_stats()}}
             
         except Exception as e:
             self.logger.error(f"Error generating content: {str(e)}")
@@ -162,4 +295,343 @@ class ContentGenerator:
                 "error": str(e),
                 "topic": topic,
                 "timestamp": datetime.now().isoformat()
-            } 
\ No newline at end of file
+            }
+
+    def _generate_with_crew(self, topic: str, additional_context: Optional[Dict]) -> Dict:
+        """Run the strategist and writer crew, then clean the post."""
+        content_strategist, content_writer, content_cleaner = self.create_agents()
+        
+        tasks = self.create_tasks(
+            content_strategist, 
+            content_writer, 
+            content_cleaner, 
+            topic,
+            additional_context
+        )
+        
+        agents = [content_strategist, content_writer, content_cleaner]
+        if not self.use_llm_cleaner:
+            # clean_post does the cleaner's job locally, saving an LLM round trip
+            agents, tasks = agents[:2], tasks[:2]
+
+        crew = Crew(
+            agents=agents,
+            tasks=tasks,
+            verbose=True
+        )
+        
+        result = crew.kickoff()
+        usage = getattr(crew, "usage_metrics", None) or {}
+        return {"content": clean_post(str(result)), "usage": dict(usage)}
+
+    def _generate_fast(self, topic: str, additional_context: Optional[Dict]) -> Dict:
+        """Plan and write the post in a single structured LLM call."""
+        if not self._client:
+            self._client = OpenAI()
+        response = self._client.chat.completions.create(
+            model=self.model,
+            temperature=0.7,
+            messages=[
+                {"role": "system", "content": FAST_MODE_SYSTEM_PROMPT},
+                {"role": "user", "content": self._stage_prompt("fast", topic, additional_context)}
+            ]
+        )
+        post = GeneratedPost.from_llm_output(response.choices[0].message.content)
+        usage = response.usage.model_dump() if response.usage else {}
+        return {"content": post.to_post(), "post": asdict(post), "usage": usage}
+
+    async def stream_content(
+        self,
+        topic: str,
+        additional_context: Optional[Dict] = None,
+        use_cache: bool = True
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Generate content for the topic, yielding tokens as they arrive.
+
+        The strategy and writing stages are streamed straight from the model;
+        the writer sees the finished strategy, as in the crew. A final
+        "cleaning" event carries the cleaned post and a result dict shaped
+        like generate_content's. Breaking out of the loop, or calling
+        aclose(), closes the open response so no further tokens are paid for.
+
+        Args:
+            topic: The main topic for the post
+            additional_context: Optional dictionary with additional context
+            use_cache: If False, skip the cache lookup
+
+        Yields:
+            StreamEvent per chunk; stage is "strategy", "writing" or "cleaning"
+        """
+        mode = "stream"
+        if use_cache:
+            cached = self._cached_result(topic, additional_context, mode)
+            if cached:
+                yield StreamEvent("cleaning", cached["content"], final=True, result=cached)
+                return
+
+        if not self._async_client:
+            self._async_client = AsyncOpenAI()
+        started = time.monotonic()
+        outputs: Dict[str, str] = {}
+        stages = [
+            ("strategy", STRATEGIST_PROFILE, self._stage_prompt("strategy", topic, additional_context)),
+            ("writing", WRITER_PROFILE, self._stage_prompt("writing", topic, additional_context)),
+        ]
+        self.logger.info(f"Starting {mode} content generation for topic: {topic}")
+        try:
+            for stage, profile, prompt in stages:
+                if outputs:
+                    prompt += f"\n\nContent strategy to follow:\n{outputs['strategy']}"
+                stream = await self._async_client.chat.completions.create(
+                    model=self.model,
+                    temperature=0.7,
+                    stream=True,
+                    messages=[
+                        {"role": "system", "content": _system_prompt(profile)},
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+                parts = []
+                try:
+                    async for chunk in stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            parts.append(delta)
+                            yield StreamEvent(stage, delta)
+                finally:
+                    # Stops generation server-side when the caller stops early
+                    await stream.response.aclose()
+                outputs[stage] = "".join(parts)
+                yield StreamEvent(stage, outputs[stage], final=True)
+        except Exception as e:
+            self.logger.error(f"Error streaming content: {str(e)}")
+            yield StreamEvent("cleaning", "", final=True, result={
+                "status": "error",
+                "error": str(e),
+                "topic": topic,
+                "timestamp": datetime.now().isoformat()
+            })
+            return
+
+        latency = time.monotonic() - started
+        # Streamed responses carry no usage; estimate at ~4 characters per token
+        usage = {"total_tokens": sum(len(text) for text in outputs.values()) // 4}
+        self._record_run(mode, latency, usage)
+        generated = {
+            "content": clean_post(outputs["writing"]),
+            "usage": usage,
+            "generated_at": datetime.now().isoformat(),
+            "topic": topic,
+            "status": "success",
+            "mode": mode,
+            "latency_seconds": round(latency, 2)
+        }
+        if self.cache:
+            self.cache.put(
+                cache_key(topic, additional_context, PROMPT_VERSION, self.model, mode), generated, latency
+            )
+        yield StreamEvent(
+            "cleaning",
+            generated["content"],
+            final=True,
+            result={**generated, "cache": {"hit": False, **self._cache_stats()}}
+        )
+
+    def generate_variants(
+        self,
+        topic: str,
+        n: int = 3,
+        recent_posts: Optional[List[str]] = None,
+        additional_context: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Write n candidate posts in one request and keep the best one.
+
+        The strategy is written once. A single writer request asks for n
+        completions, which are ranked locally by length, hook, hashtag count
+        and similarity to recent posts; only the winner is cleaned.
+
+        Args:
+            topic: The main topic for the post
+            n: Number of candidates to write
+            recent_posts: Recently published posts to avoid repeating
+            additional_context: Optional dictionary with additional context
+
+        Returns:
+            Dict containing the winning content, the ranking and token cost
+        """
+        mode = "variants"
+        try:
+            self.logger.info(f"Starting {mode} content generation for topic: {topic} (n={n})")
+            started = time.monotonic()
+            if not self._client:
+                self._client = OpenAI()
+            strategy = self._complete(
+                STRATEGIST_PROFILE, self._stage_prompt("strategy", topic, additional_context)
+            )
+            writing = self._complete(
+                WRITER_PROFILE,
+                self._stage_prompt("writing", topic, additional_context)
+                + f"\n\nContent strategy to follow:\n{strategy.choices[0].message.content}",
+                n=n
+            )
+            ranked = rank_variants(
+                [choice.message.content or "" for choice in writing.choices], recent_posts or []
+            )
+            latency = time.monotonic() - started
+
+            strategy_usage = strategy.usage.model_dump() if strategy.usage else {}
+            writing_usage = writing.usage.model_dump() if writing.usage else {}
+            total = strategy_usage.get("total_tokens", 0) + writing_usage.get("total_tokens", 0)
+            # Separate runs would each pay for a strategy, the writer prompt and one completion
+            separate = n * (
+                strategy_usage.get("total_tokens", 0)
+                + writing_usage.get("prompt_tokens", 0)
+                + writing_usage.get("completion_tokens", 0) / max(len(writing.choices), 1)
+            )
+            cost = {
+                "total_tokens": total,
+                "separate_runs_tokens": round(separate),
+                "savings": round(1 - total / separate, 3) if separate else 0.0,
+            }
+            self._record_run(mode, latency, {"total_tokens": total})
+            self.logger.info(
+                f"Chose variant scoring {ranked[0].score} of {len(ranked)}: "
+                f"{total} tokens vs ~{cost['separate_runs_tokens']} for {n} separate runs"
+            )
+            return {
+                "content": clean_post(ranked[0].text),
+                "variants": [{"score": v.score, "components": v.components} for v in ranked],
+                "usage": {"total_tokens": total},
+                "cost": cost,
+                "generated_at": datetime.now().isoformat(),
+                "topic": topic,
+                "status": "success",
+                "mode": mode,
+                "latency_seconds": round(latency, 2)
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error generating variants: {str(e)}")
+            return {
+                "status": "error",
+                "error": str(e),
+                "topic": topic,
+                "timestamp": datetime.now().isoformat()
+            }
+
+    def _complete(self, profile: Dict, prompt: str, n: int = 1):
+        """Run one agent stage as a plain chat completion."""
+        return self._client.chat.completions.create(
+            model=self.model,
+            temperature=0.9 if n > 1 else 0.7,
+            n=n,
+            messages=[
+                {"role": "system", "content": _system_prompt(profile)},
+                {"role": "user", "content": prompt}
+            ]
+        )
+
+    def _record_run(self, mode: str, latency: float, usage: Dict):
+        """Accumulate latency and token usage per generation mode."""
+        with self._stats_lock:
+            stats = self.mode_stats.setdefault(
+                mode, {"runs": 0, "latency_seconds": 0.0, "total_tokens": 0}
+            )
+            stats["runs"] += 1
+            stats["latency_seconds"] += latency
+            stats["total_tokens"] += usage.get("total_tokens", 0)
+
+    def mode_report(self) -> Dict:
+        """Average latency and tokens per run for each mode used so far."""
+        with self._stats_lock:
+            return {
+                mode: {
+                    "runs": stats["runs"],
+                    "avg_latency_seconds": round(stats["latency_seconds"] / stats["runs"], 2),
+                    "avg_total_tokens": round(stats["total_tokens"] / stats["runs"]),
+                }
+                for mode, stats in self.mode_stats.items()
+            }
+
+    def _cached_result(
+        self,
+        topic: str,
+        additional_context: Optional[Dict],
+        mode: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Return a cached result for the topic, context and mode, if there is one."""
+        if not self.cache:
+            return None
+        cached = self.cache.get(
+            cache_key(topic, additional_context, PROMPT_VERSION, self.model, mode or self.mode)
+        )
+        if not cached:
+            return None
+        self.logger.info(f"Using cached content for topic: {topic}")
+        return {
+            **cached["result"],
+            "topic": topic,
+            "cache": {"hit": True, "saved_latency_seconds": round(cached["latency"], 2),
+                      **self._cache_stats()}
+        }
+
+    async def generate_many(
+        self,
+        topics: List[str],
+        max_concurrency: int = 4,
+        rate_limiter: Optional[OpenAIRateLimiter] = None,
+        additional_context: Optional[Dict] = None,
+        use_cache: bool = True,
+        estimated_tokens: int = ESTIMATED_TOKENS_PER_GENERATION
+    ) -> AsyncIterator[Dict]:
+        """
+        Generate content for many topics concurrently.
+
+        Crews run in a dedicated thread pool. Every crew reserves its
+        requests and estimated tokens from the shared rate limiter before
+        starting; cache hits skip both the limiter and the pool.
+        
+        Args:
+            topics: Topics to generate posts for
+            max_concurrency: Maximum number of crews running at once
+            rate_limiter: Optional limiter shared with other callers
+            additional_context: Optional dictionary with additional context
+            use_cache: If False, always run the crews and skip the cache
+            estimated_tokens: Tokens reserved per generation
+            
+        Yields:
+            Result dicts as each topic finishes, in completion order
+        """
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="crew")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(topic: str) -> Dict:
+            cached = self._cached_result(topic, additional_context) if use_cache else None
+            if cached:
+                return cached
+            async with semaphore:
+                if rate_limiter:
+                    await rate_limiter.acquire(self.llm_calls, estimated_tokens)
+                # The lookup above already missed, so skip it in generate_content
+                return await loop.run_in_executor(
+                    executor, self.generate_content, topic, additional_context, False
+                )
+
+        tasks = [asyncio.create_task(run(topic)) for topic in topics]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _cache_stats(self) -> Dict:
+        """Cache hit rate and saved latency for the result metadata."""
+        if not self.cache:
+            return {}
+        stats = self.cache.stats()
+        return {"hit_rate": stats["hit_rate"], "total_saved_latency_seconds": stats["saved_latency_seconds"]}
@@ -0,0 +1,130 @@
+import json
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # optional; fall back to a regex estimate
+    tiktoken = None
+
+# Tokens of additional context each prompt may carry
+STAGE_BUDGETS = {"strategy": 600, "writing": 400, "fast": 800}
+
+# Items cut shorter than this are dropped rather than sent as a fragment
+MIN_ITEM_TOKENS = 20
+
+# Sentences sharing this much of their wording with one already packed are dropped
+DUPLICATE_OVERLAP = 0.8
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"\w+")
+# Roughly one token per word or punctuation mark, close to BPE counts for English
+_TOKEN_ESTIMATE = re.compile(r"\w+|[^\w\s]")
+
+
+class ContextPacker:
+    def __init__(self, budgets: Optional[Dict[str, int]] = None, encoding: str = "cl100k_base"):
+        """
+        Initialize a packer that fits additional context into a token budget.
+
+        Args:
+            budgets: Token budget per stage; defaults to STAGE_BUDGETS
+            encoding: tiktoken encoding used to count tokens when installed
+        """
+        self.logger = logging.getLogger(__name__)
+        self.budgets = {**STAGE_BUDGETS, **(budgets or {})}
+        self.encoding_name = encoding
+        self._encoding = None
+        # Loaded on first use; tiktoken downloads the encoding the first time
+        self._encoding_loaded = tiktoken is None
+
+    def _get_encoding(self):
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            try:
+                self._encoding = tiktoken.get_encoding(self.encoding_name)
+            except Exception as e:
+                self.logger.warning(f"Could not load tiktoken encoding, estimating token counts: {str(e)}")
+        return self._encoding
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens with tiktoken, or estimate them if it is unavailable."""
+        encoding = self._get_encoding()
+        if encoding:
+            return len(encoding.encode(text))
+        return len(_TOKEN_ESTIMATE.findall(text))
+
+    def _items(self, context: Dict) -> List[Tuple[str, str]]:
+        """Flatten the context dict into (label, text) items, keeping caller order."""
+        items = []
+        for label, value in context.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for entry in values:
+                text = entry if isinstance(entry, str) else json.dumps(entry, default=str)
+                if text.strip():
+                    items.append((str(label).replace("_", " "), text.strip()))
+        return items
+
+    def _rank(self, items: List[Tuple[str, str]], topic: str) -> List[Tuple[str, str]]:
+        """Order items by overlap with the topic, then by their position in the context."""
+        topic_words = set(_WORD.findall(topic.lower()))
+
+        def relevance(indexed):
+            position, (label, text) = indexed
+            words = set(_WORD.findall(f"{label} {text}".lower()))
+            overlap = len(topic_words & words) / len(topic_words) if topic_words else 0.0
+            return (-overlap, position)
+
+        return [item for _, item in sorted(enumerate(items), key=relevance)]
+
+    def pack(self, context: Optional[Dict], topic: str, stage: str) -> str:
+        """
+        Render the most relevant context that fits the stage's budget.
+
+        Items are ranked by how much of the topic they mention. Sentences
+        that repeat one already packed are dropped, and the last item that
+        fits is cut at a sentence boundary.
+
+        Args:
+            context: additional_context dict; values are strings or lists of strings
+            topic: Topic of the post, used for ranking
+            stage: Key into the budgets, e.g. "strategy" or "writing"
+
+        Returns:
+            A prompt section, or an empty string when there is no context
+        """
+        if not context:
+            return ""
+        budget = self.budgets.get(stage, STAGE_BUDGETS["writing"])
+        seen: List[set] = []
+        lines = []
+        used = 0
+        for label, text in self._rank(self._items(context), topic):
+            kept, kept_words = [], []
+            item_cost = 0
+            truncated = False
+            for sentence in _SENTENCE.split(text):
+                words = set(_WORD.findall(sentence.lower()))
+                if not words or any(
+                    len(words & other) / min(len(words), len(other)) >= DUPLICATE_OVERLAP
+                    for other in seen + kept_words
+                ):
+                    continue
+                cost = self.count_tokens(sentence)
+                if used + item_cost + cost > budget:
+                    truncated = True
+                    break
+                kept.append(sentence)
+                kept_words.append(words)
+                item_cost += cost
+            if kept and (not truncated or item_cost >= MIN_ITEM_TOKENS):
+                lines.append(f"- {label}: {' '.join(kept)}")
+                seen.extend(kept_words)
+                used += item_cost
+            if used >= budget - MIN_ITEM_TOKENS:
+                break
+        if not lines:
+            return ""
+        self.logger.debug(f"Packed {used}/{budget} context tokens for {stage}")
+        return "Additional context:\n" + "\n".join(lines)
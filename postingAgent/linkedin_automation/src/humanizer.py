@@ -0,0 +1,83 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from typing import Optional
+
+
+class RealClock:
+    """Wall-clock time backed by the running event loop."""
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    Simulated time for tests and benchmarks.
+
+    Sleepers are parked on a timer heap. Once every other task has had a
+    chance to run, the clock jumps straight to the earliest deadline and
+    wakes those sleepers, so concurrent delays overlap exactly as they would
+    in real time without actually waiting.
+    """
+
+    def __init__(self, start: float = 0.0, idle_spins: int = 20):
+        """
+        Args:
+            start: Initial virtual time in seconds
+            idle_spins: Event loop iterations to wait before treating the
+                loop as idle and advancing time
+        """
+        self._now = start
+        self.idle_spins = idle_spins
+        self._timers = []
+        self._counter = itertools.count()
+        self._driver = None
+
+    def now(self) -> float:
+        return self._now
+
+    async def sleep(self, seconds: float):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (self._now + max(seconds, 0.0), next(self._counter), future))
+        if self._driver is None or self._driver.done():
+            self._driver = asyncio.ensure_future(self._advance())
+        await future
+
+    async def _advance(self):
+        """Advance virtual time whenever the loop has nothing else to do."""
+        while self._timers:
+            for _ in range(self.idle_spins):
+                await asyncio.sleep(0)
+            deadline = self._timers[0][0]
+            self._now = max(self._now, deadline)
+            while self._timers and self._timers[0][0] <= deadline:
+                _, _, future = heapq.heappop(self._timers)
+                if not future.done():
+                    future.set_result(None)
+
+
+class Humanizer:
+    def __init__(self, clock=None, seed: Optional[int] = None):
+        """
+        Initialize the humanizer that paces browser actions like a person.
+
+        Args:
+            clock: RealClock (default) or VirtualClock to run in simulated time
+            seed: Optional seed so delay sequences are reproducible
+        """
+        self.clock = clock or RealClock()
+        self.random = random.Random(seed)
+        self.total_delay = 0.0
+
+    async def delay(self, min_seconds: float = 1.0, max_seconds: float = 3.0) -> float:
+        """Wait a random, human-looking time without blocking the event loop."""
+        seconds = self.random.uniform(min_seconds, max_seconds)
+        self.total_delay += seconds
+        await self.clock.sleep(seconds)
+        return seconds
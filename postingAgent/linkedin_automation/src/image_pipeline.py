@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Tuple
+
+from PIL import Image, ImageOps
+
+# LinkedIn recommends 1200px on the long edge for feed images
+MAX_DIMENSIONS = (1200, 1200)
+JPEG_QUALITY = 85
+# Bump when the processing below changes so old cache entries are ignored
+PIPELINE_VERSION = "1"
+
+
+def _process_image(source: str, destination: str, max_size: Tuple[int, int], quality: int) -> str:
+    """Resize, flatten and re-encode an image without metadata. Runs in a worker process."""
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(max_size, Image.LANCZOS)
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        temp = Path(destination).with_suffix(".tmp")
+        # No exif/icc arguments, so camera and location metadata are dropped
+        image.save(temp, "JPEG", quality=quality, optimize=True, progressive=True)
+        temp.replace(destination)
+    return destination
+
+
+class ImagePreprocessor:
+    def __init__(
+        self,
+        cache_dir: str,
+        max_workers: int = 2,
+        max_size: Tuple[int, int] = MAX_DIMENSIONS,
+        quality: int = JPEG_QUALITY
+    ):
+        """
+        Initialize the image pipeline that prepares post attachments.
+
+        Args:
+            cache_dir: Directory for processed images, named by content hash
+            max_workers: Number of worker processes for resizing
+            max_size: Maximum width and height of the output
+            quality: JPEG quality of the output
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers
+        self.max_size = max_size
+        self.quality = quality
+        self._executor = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _cache_key(self, data: bytes) -> str:
+        digest = hashlib.sha256(data)
+        digest.update(f"{PIPELINE_VERSION}:{self.max_size}:{self.quality}".encode())
+        return digest.hexdigest()
+
+    async def prepare(self, image_path: str) -> str:
+        """
+        Return a LinkedIn-ready copy of the image, processing it at most once.
+
+        Identical images are recognized by content, so the same asset posted
+        from several accounts, or under different file names, is only
+        processed once. Concurrent requests for it share one worker run.
+
+        Args:
+            image_path: Path to the original image
+
+        Returns:
+            Path to the processed JPEG
+        """
+        data = await asyncio.to_thread(Path(image_path).read_bytes)
+        key = self._cache_key(data)
+        destination = self.cache_dir / f"{key}.jpg"
+
+        if destination.exists():
+            self.stats["hits"] += 1
+            return str(destination)
+        if key in self._in_flight:
+            self.stats["hits"] += 1
+            return await asyncio.shield(self._in_flight[key])
+
+        self.stats["misses"] += 1
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if not self._executor:
+            # Forking a process that runs browser and crew threads can deadlock the child
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, _process_image, str(image_path), str(destination), self.max_size, self.quality
+        )
+        self._in_flight[key] = future
+        try:
+            result = await asyncio.shield(future)
+            self.logger.info(
+                f"Processed {image_path}: {len(data) // 1024}KB -> "
+                f"{destination.stat().st_size // 1024}KB"
+            )
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
+    def close(self):
+        """Shut down the worker processes. Blocks until they exit."""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
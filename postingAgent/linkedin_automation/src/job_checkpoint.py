@@ -0,0 +1,108 @@
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Pipeline stages in order; a job never moves back to an earlier one
+STAGES = ("generated", "sanitized", "logged_in", "posting", "posted")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job_key TEXT PRIMARY KEY,
+    user_id TEXT,
+    topic TEXT,
+    stage TEXT,
+    content TEXT,
+    post_urn TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class UnconfirmedPostError(Exception):
+    """The post button was clicked but whether the post went out is unknown."""
+
+
+def reached(checkpoint: Optional[Dict], stage: str) -> bool:
+    """True if the checkpointed job has completed `stage`."""
+    if not checkpoint or not checkpoint["stage"]:
+        return False
+    return STAGES.index(checkpoint["stage"]) >= STAGES.index(stage)
+
+
+class JobCheckpoints:
+    def __init__(self, db_path: str):
+        """
+        Initialize the store of per-job progress.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.db_path))
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(SCHEMA)
+        self.db.commit()
+
+    def load(self, job_key: str) -> Optional[Dict]:
+        """Return the job's checkpoint with its content decoded, or None."""
+        row = self.db.execute("SELECT * FROM checkpoints WHERE job_key = ?", (job_key,)).fetchone()
+        if not row:
+            return None
+        checkpoint = dict(row)
+        checkpoint["content"] = json.loads(checkpoint["content"]) if checkpoint["content"] else None
+        return checkpoint
+
+    def save(
+        self,
+        job_key: str,
+        stage: str,
+        user_id: Optional[str] = None,
+        topic: Optional[str] = None,
+        content: Optional[Dict] = None,
+        post_urn: Optional[str] = None
+    ):
+        """
+        Record that a job completed a stage.
+
+        Stages finishing out of order, such as login before generation, do
+        not move the job back; given fields are stored either way.
+        """
+        current = self.load(job_key)
+        if reached(current, stage):
+            stage = current["stage"]
+        self.db.execute(
+            "INSERT INTO checkpoints (job_key, user_id, topic, stage, content, post_urn, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(job_key) DO UPDATE SET stage = excluded.stage, "
+            "user_id = COALESCE(excluded.user_id, user_id), topic = COALESCE(excluded.topic, topic), "
+            "content = COALESCE(excluded.content, content), post_urn = COALESCE(excluded.post_urn, post_urn), "
+            "updated_at = excluded.updated_at",
+            (job_key, user_id, topic, stage,
+             json.dumps(content, default=str) if content is not None else None, post_urn, time.time())
+        )
+        self.db.commit()
+        self.logger.info(f"Job {job_key} reached stage {stage}")
+
+    def record_failure(self, job_key: str, error: str) -> int:
+        """Count a failed attempt and return the number of attempts so far."""
+        self.db.execute(
+            "INSERT INTO checkpoints (job_key, attempts, last_error, updated_at) VALUES (?, 1, ?, ?) "
+            "ON CONFLICT(job_key) DO UPDATE SET attempts = attempts + 1, last_error = excluded.last_error, "
+            "updated_at = excluded.updated_at",
+            (job_key, error, time.time())
+        )
+        self.db.commit()
+        return self.db.execute(
+            "SELECT attempts FROM checkpoints WHERE job_key = ?", (job_key,)
+        ).fetchone()[0]
+
+    def close(self):
+        """Close the checkpoint database."""
+        self.db.close()
@@ -1,34 +1,103 @@
-from playwright.async_api import async_playwright
 import json
 import logging
-import random
-import time
-from typing import Dict, Optional
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
 from pathlib import Path
 import asyncio
 from datetime import datetime
 
+from browser_pool import BrowserContextPool
+from humanizer import Humanizer
+from selector_resolver import SelectorResolver
+from trace_capture import TraceRecorder
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Candidate selectors per step, most specific first; the resolver races them,
+# prefers the earliest one that matches and remembers it
+SHARE_BOX_SELECTORS = [
+    'button[data-control-name="create_post"]',
+    'div[class*="share-box-feed-entry"]',
+    'button[aria-label*="Create a post"]',
+    'div[class*="share-box"]',
+    'div[role="textbox"]'
+]
+
+POST_BUTTON_SELECTORS = [
+    'button.share-actions__primary-action',
+    'button[class*="share-actions__primary-action"]',
+    'button[aria-label="Post"]',
+    'button:has-text("Post")',
+    'button.artdeco-button--primary',
+]
+
+# Requests that create a share, and the toast LinkedIn shows once it is live
+SHARE_ENDPOINTS = ("/contentcreation/normShares", "/contentcreation/dash/shares", "ugcPosts", "DashShares")
+SUCCESS_TOAST_SELECTOR = 'div.artdeco-toast-item a[href*="urn:li:"]'
+URN_PATTERN = re.compile(r"urn:li:(?:activity|share|ugcPost):\d+")
+
+# The account's own latest posts, used to check whether an unconfirmed post went out
+RECENT_ACTIVITY_URL = "https://www.linkedin.com/in/me/recent-activity/all/"
+FEED_UPDATE_SELECTOR = 'div[data-urn^="urn:li:activity"]'
+
+@dataclass
+class PostResult:
+    """Outcome of create_post; truthy only when the share was confirmed."""
+    success: bool
+    post_urn: Optional[str] = None
+    error: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return self.success
+
 class LinkedInPoster:
-    def __init__(self, credentials_path: str):
+    def __init__(
+        self,
+        credentials_path: str,
+        browser_pool: Optional[BrowserContextPool] = None,
+        humanizer: Optional[Humanizer] = None,
+        selector_resolver: Optional[SelectorResolver] = None,
+        trace: Optional[TraceRecorder] = None
+    ):
         """
         Initialize the LinkedIn poster with credentials file path.
         
         Args:
             credentials_path: Path to the credentials JSON file
+            browser_pool: Optional shared pool of warm browser contexts. When
+                omitted, a private single-context pool is created and shut
+                down on close().
+            humanizer: Optional delay scheduler; pass one with a VirtualClock
+                to run in simulated time
+            selector_resolver: Optional shared resolver for share-box and
+                post-button selectors
+            trace: Optional recorder for step timings and failure bundles
         """
         self.logger = logging.getLogger(__name__)
         self.credentials_path = Path(credentials_path)
         self.credentials = self._load_credentials()
         self.current_user = None
-        self.browser = None
+        self.owns_pool = browser_pool is None
+        self.browser_pool = browser_pool or BrowserContextPool(
+            self.credentials_path.parent / "sessions",
+            max_contexts=1
+        )
+        self.humanizer = humanizer or Humanizer()
+        self.selector_resolver = selector_resolver or SelectorResolver(
+            self.credentials_path.parent / "selector_ranking.json"
+        )
+        self.trace = trace or TraceRecorder(
+            f"post-{datetime.now():%Y%m%d-%H%M%S-%f}",
+            self.credentials_path.parent / "traces"
+        )
+        self.pooled = None
         self.context = None
         self.page = None
-        self.playwright = None
 
     def _load_credentials(self) -> Dict:
         """Load and validate credentials from JSON file."""
@@ -42,32 +111,35 @@ class LinkedInPoster:
             self.logger.error(f"Error loading credentials: {str(e)}")
             raise
 
-    def _random_delay(self, min_seconds: float = 1.0, max_seconds: float = 3.0):
-        """Add random delay to simulate human behavior."""
-        time.sleep(random.uniform(min_seconds, max_seconds))
+    async def _random_delay(self, min_seconds: float = 1.0, max_seconds: float = 3.0):
+        """Add random delay to simulate human behavior without blocking the event loop."""
+        await self.humanizer.delay(min_seconds, max_seconds)
 
-    async def _init_browser(self):
-        """Initialize browser with stealth settings."""
+    async def _init_browser(self, user_id: str):
+        """Acquire a warm browser context for the user from the pool."""
         try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(headless=False)
-            self.context = await self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            )
-            self.page = await self.context.new_page()
-            
-            # Add stealth scripts
-            await self.context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-            """)
-            
+            self._release_context()
+            self.pooled = await self.browser_pool.acquire(user_id)
+            self.context = self.pooled.context
+            self.page = self.pooled.page
         except Exception as e:
             self.logger.error(f"Error initializing browser: {str(e)}")
             raise
 
+    async def _has_valid_session(self) -> bool:
+        """Check whether the pooled context is still logged in."""
+        if not self.pooled.has_session:
+            return False
+        try:
+            self.logger.info("Checking saved LinkedIn session...")
+            await self.page.goto('https://www.linkedin.com/feed/')
+            await self.page.wait_for_selector('div[class*="share-box-feed-entry"]', timeout=5000)
+            return True
+        except Exception:
+            self.logger.info("Saved session expired, falling back to login form")
+            await self.browser_pool.expire_session(self.current_user["id"])
+            return False
+
     async def login(self, user_id: str) -> bool:
         """
         Log into LinkedIn with specified user credentials.
@@ -79,142 +151,222 @@ class LinkedInPoster:
 
             self.current_user = user
             
-            if not self.page:
-                await self._init_browser()
-
-            self.logger.info("Navigating to LinkedIn login page...")
-            await self.page.goto('https://www.linkedin.com/login')
-            self._random_delay()
-
-            # Fill login form
-            self.logger.info("Filling login form...")
-            await self.page.fill('input#username', user["email"])
-            self._random_delay(0.5, 1.5)
-            await self.page.fill('input#password', user["password"])
-            self._random_delay(0.5, 1.5)
-
-            # Click login button
-            self.logger.info("Clicking login button...")
-            await self.page.click('button[type="submit"]')
+            if not self.pooled or self.pooled.user_id != user_id:
+                await self._init_browser(user_id)
+
+            async with self.trace.step("session_check"):
+                if await self._has_valid_session():
+                    self.logger.info("Reusing saved LinkedIn session")
+                    return True
+
+            async with self.trace.step("login_form"):
+                self.logger.info("Navigating to LinkedIn login page...")
+                await self.page.goto('https://www.linkedin.com/login')
+                await self._random_delay()
+
+                # Fill login form
+                self.logger.info("Filling login form...")
+                await self.page.fill('input#username', user["email"])
+                await self._random_delay(0.5, 1.5)
+                await self.page.fill('input#password', user["password"])
+                await self._random_delay(0.5, 1.5)
+
+                # Click login button
+                self.logger.info("Clicking login button...")
+                await self.page.click('button[type="submit"]')
             
             # Wait for navigation and verify login
             try:
-                # Wait for either the post creation button or the feed
-                self.logger.info("Waiting for home page to load...")
-                await self.page.wait_for_selector('div[class*="share-box-feed-entry"]', timeout=10000)
+                async with self.trace.step("login_verify"):
+                    # Wait for either the post creation button or the feed
+                    self.logger.info("Waiting for home page to load...")
+                    await self.page.wait_for_selector('div[class*="share-box-feed-entry"]', timeout=10000)
                 self.logger.info("Successfully verified login - found post creation area")
+                await self.browser_pool.save_session(user_id)
                 return True
             except Exception as e:
                 self.logger.error(f"Login verification failed: {str(e)}")
-                # Take a screenshot for debugging
-                await self.page.screenshot(path="login_debug.png")
-                self.logger.info("Saved debug screenshot as login_debug.png")
+                await self.trace.dump(self.page, f"Login verification failed: {str(e)}")
                 return False
 
         except Exception as e:
             self.logger.error(f"Login error: {str(e)}")
+            await self.trace.dump(self.page, f"Login error: {str(e)}")
             return False
 
-    async def create_post(self, content: str, image_path: Optional[str] = None) -> bool:
+    async def create_post(
+        self,
+        content: str,
+        image_path: Optional[str] = None,
+        on_submit: Optional[Callable[[], None]] = None
+    ) -> PostResult:
         """
         Create a new LinkedIn post with optional image.
+
+        Args:
+            content: Text of the post
+            image_path: Optional path to image file
+            on_submit: Called right before the post button is clicked; from
+                then on a failure may still have published the post
+
+        Returns:
+            PostResult that is truthy only once LinkedIn confirmed the share,
+            carrying per-step timings and the post URN or failure reason
         """
         try:
             if not self.page:
                 raise ValueError("Browser not initialized. Please login first.")
 
-            # Debug: Take screenshot before attempting to click
-            await self.page.screenshot(path="before_post.png")
-            self.logger.info("Saved screenshot before attempting to post")
+            await self.trace.checkpoint(self.page, "before_post")
 
-            # Try to find the post creation area using multiple possible selectors
-            selectors = [
-                'button[data-control-name="create_post"]',
-                'div[class*="share-box-feed-entry"]',
-                'button[aria-label*="Create a post"]',
-                'div[class*="share-box"]',
-                'div[role="textbox"]'
-            ]
-
-            for selector in selectors:
+            # Find the post creation area, racing all known selectors
+            async with self.trace.step("open_share_box"):
                 try:
-                    self.logger.info(f"Trying to find post button with selector: {selector}")
-                    element = await self.page.wait_for_selector(selector, timeout=5000)
-                    if element:
-                        self.logger.info(f"Found element with selector: {selector}")
-                        await element.click()
-                        break
-                except Exception as e:
-                    self.logger.info(f"Selector {selector} not found: {str(e)}")
-
-            # Add a delay to let any animations complete
-            self._random_delay(2, 3)
-
-            # Take another screenshot after clicking
-            await self.page.screenshot(path="after_click.png")
-            self.logger.info("Saved screenshot after clicking post button")
-
-            # Try to find the post input area
+                    _, element = await self.selector_resolver.resolve(self.page, "share_box", SHARE_BOX_SELECTORS)
+                    await element.click()
+                except TimeoutError as e:
+                    self.logger.info(f"Post creation area not found: {str(e)}")
+
+            # The editor becoming visible is the signal that the modal finished opening
             try:
-                await self.page.wait_for_selector('div[role="textbox"]', timeout=5000)
+                async with self.trace.step("find_textbox"):
+                    await self.page.wait_for_selector('div[role="textbox"]', state="visible", timeout=5000)
                 self.logger.info("Found post input area")
             except Exception as e:
-                self.logger.error(f"Could not find post input area: {str(e)}")
-                return False
+                return await self._fail(f"Could not find post input area: {str(e)}")
+
+            await self.trace.checkpoint(self.page, "after_click")
 
             # Fill post content
-            await self.page.fill('div[role="textbox"]', content)
-            self._random_delay()
+            async with self.trace.step("fill_content"):
+                await self.page.fill('div[role="textbox"]', content)
+                await self._random_delay()
 
             # Handle image upload if provided
             if image_path:
-                input_file = await self.page.query_selector('input[type="file"]')
-                await input_file.set_input_files(image_path)
-                await self.page.wait_for_selector('img[alt="Post image"]')
-                self._random_delay(2, 4)
+                async with self.trace.step("attach_image"):
+                    input_file = await self.page.query_selector('input[type="file"]')
+                    await input_file.set_input_files(image_path)
+                    await self.page.wait_for_selector('img[alt="Post image"]', state="visible")
 
-            # Take screenshot before final post
-            await self.page.screenshot(path="before_final_post.png")
+            await self.trace.checkpoint(self.page, "before_final_post")
             
-            # Try different selectors for the post button
-            post_button_selectors = [
-                'button.share-actions__primary-action',
-                'button.artdeco-button--primary',
-                'button[class*="share-actions__primary-action"]',
-                '#ember534',  # Note: this ID might change dynamically
-                'button:has-text("Post")',
-                'button[aria-label="Post"]',
-            ]
-
-            for selector in post_button_selectors:
-                try:
-                    self.logger.info(f"Trying to find final post button with selector: {selector}")
-                    # Wait for the button to be visible and clickable
-                    button = await self.page.wait_for_selector(selector, state="visible", timeout=5000)
-                    if button:
-                        self.logger.info(f"Found post button with selector: {selector}")
-                        self._random_delay(1, 2)  # Small delay before clicking
-                        await button.click()
-                        self.logger.info(f"Successfully clicked post button with selector: {selector}")
-                        break
-                except Exception as e:
-                    self.logger.info(f"Could not click post button with selector {selector}: {str(e)}")
-
-            self.logger.info("Post created successfully")
-            return True
+            # Find the final post button, racing all known selectors
+            try:
+                async with self.trace.step("find_post_button"):
+                    selector, button = await self.selector_resolver.resolve(self.page, "post_button", POST_BUTTON_SELECTORS)
+            except TimeoutError as e:
+                return await self._fail(f"Could not find post button: {str(e)}")
+
+            await self._random_delay(1, 2)  # Small delay before clicking
+            if on_submit:
+                on_submit()
+            try:
+                async with self.trace.step("confirm_post"):
+                    post_urn = await self._click_and_confirm(button)
+            except Exception as e:
+                return await self._fail(f"Post was not confirmed: {str(e)}")
+
+            self.logger.info(f"Post created successfully: {post_urn}")
+            return PostResult(True, post_urn=post_urn, timings=dict(self.trace.timings))
 
         except Exception as e:
-            self.logger.error(f"Error creating post: {str(e)}")
-            return False
+            return await self._fail(f"Error creating post: {str(e)}")
+
+    async def _click_and_confirm(self, button, timeout: int = 15000) -> str:
+        """
+        Click the post button and wait for LinkedIn to confirm the share.
+
+        Whichever arrives first wins: the share API response or the success
+        toast with its "View post" link.
+
+        Returns:
+            URN of the new post, or "unknown" if the confirmation carried none
+        """
+        def is_share_response(response) -> bool:
+            return (response.request.method == "POST"
+                    and any(endpoint in response.url for endpoint in SHARE_ENDPOINTS))
+
+        response_wait = asyncio.ensure_future(
+            self.page.wait_for_event("response", predicate=is_share_response, timeout=timeout)
+        )
+        toast_wait = asyncio.ensure_future(
+            self.page.wait_for_selector(SUCCESS_TOAST_SELECTOR, timeout=timeout)
+        )
+        pending = {response_wait, toast_wait}
+        try:
+            await button.click()
+            errors = []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        errors.append(str(task.exception()))
+                        continue
+                    if task is response_wait:
+                        response = task.result()
+                        if not response.ok:
+                            raise Exception(f"Share request failed with HTTP {response.status}")
+                        urn = response.headers.get("x-restli-id") or ""
+                        if not URN_PATTERN.search(urn):
+                            urn = await response.text()
+                    else:
+                        urn = await task.result().get_attribute("href") or ""
+                    match = URN_PATTERN.search(urn)
+                    return match.group(0) if match else "unknown"
+            raise TimeoutError("; ".join(errors) or "No confirmation received")
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def find_recent_post(self, content: str, timeout: int = 15000) -> Optional[str]:
+        """
+        Look for the content among the account's latest posts.
+
+        Errors are raised rather than reported as "not found", so callers
+        never repost because a check failed.
+
+        Returns:
+            URN of the matching post ("unknown" if it carries none), or None
+        """
+        snippet = " ".join(content.split())[:80]
+        await self.page.goto(RECENT_ACTIVITY_URL, wait_until="domcontentloaded")
+        await self.page.wait_for_selector(FEED_UPDATE_SELECTOR, timeout=timeout)
+        for update in await self.page.query_selector_all(FEED_UPDATE_SELECTOR):
+            if snippet in " ".join((await update.inner_text()).split()):
+                match = URN_PATTERN.search(await update.get_attribute("data-urn") or "")
+                return match.group(0) if match else "unknown"
+        return None
+
+    async def open_feed(self, timeout: int = 10000):
+        """Go back to the feed and wait for its share box, where create_post starts."""
+        await self.page.goto('https://www.linkedin.com/feed/')
+        await self.page.wait_for_selector('div[class*="share-box-feed-entry"]', timeout=timeout)
+
+    async def _fail(self, reason: str) -> PostResult:
+        """Log a failed post, write its trace bundle and build the result."""
+        self.logger.error(reason)
+        await self.trace.dump(self.page, reason)
+        return PostResult(False, error=reason, timings=dict(self.trace.timings))
+
+    def _release_context(self):
+        """Hand the current user's context back to the pool."""
+        if self.pooled:
+            self.browser_pool.release(self.pooled.user_id)
+            self.pooled = None
+            self.context = None
+            self.page = None
 
     async def close(self):
-        """Clean up browser resources."""
+        """Release the browser context, shutting the pool down if it is private."""
         try:
-            if self.context:
-                await self.context.close()
-            if self.browser:
-                await self.browser.close()
-            if self.playwright:
-                await self.playwright.stop()
+            self._release_context()
+            if self.owns_pool:
+                await self.browser_pool.close()
         except Exception as e:
-            self.logger.error(f"Error closing browser: {str(e)}") 
\ No newline at end of file
+            self.logger.error(f"Error closing browser: {str(e)}")
+        finally:
+            self.pooled = None
+            self.context = None
+            self.page = None
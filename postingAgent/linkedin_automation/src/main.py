@@ -1,17 +1,30 @@
 import asyncio
 import argparse
+import contextlib
 import json
 import logging
+import random
+import re
 from pathlib import Path
 from datetime import datetime
-import schedule
 import time
+import uuid
 from rich.console import Console
 from rich.logging import RichHandler
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
+from browser_pool import BrowserContextPool
+from content_bank import ContentBank
+from content_cache import ContentCache
 from content_generator import ContentGenerator
-from linkedin_poster import LinkedInPoster
+from image_pipeline import ImagePreprocessor
+from job_checkpoint import JobCheckpoints, UnconfirmedPostError, reached
+from linkedin_poster import LinkedInPoster, PostResult
+from post_history import PostHistory
+from post_scheduler import PostScheduler
+from resource_blocker import ResourceBlocker
+from selector_resolver import SelectorResolver
+from trace_capture import TraceRecorder
 
 # Set up rich console for better output
 console = Console()
@@ -25,18 +38,75 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# First retry of a failed job waits about this long, doubling after each attempt
+RETRY_BASE_SECONDS = 30
+
+# Characters of streamed draft after which it must mention the topic
+OFF_TOPIC_CHECK_CHARS = 400
+
+def is_off_topic(topic: str, draft: str) -> bool:
+    """True if a long enough draft mentions none of the topic's words."""
+    keywords = set(re.findall(r"\w{4,}", topic.lower()))
+    if not keywords or len(draft) < OFF_TOPIC_CHECK_CHARS:
+        return False
+    draft = draft.lower()
+    return not any(keyword in draft for keyword in keywords)
+
 class LinkedInAutomation:
-    def __init__(self, config_dir: str):
+    def __init__(
+        self,
+        config_dir: str,
+        debug_capture: bool = False,
+        fast_mode: bool = False,
+        use_content_cache: bool = True,
+        fast_generation: bool = False,
+        stream_generation: bool = False,
+        variants: int = 1,
+        reuse_drafts: bool = False
+    ):
         """
         Initialize LinkedIn automation with configuration directory.
         
         Args:
             config_dir: Path to configuration directory containing credentials and .env
+            debug_capture: Keep DOM snapshots and screenshots of recent steps in
+                memory so failure bundles show how the job got there
+            fast_mode: Run headless and drop images, fonts, media and trackers
+            use_content_cache: If False, always generate fresh content instead
+                of reusing a recent result for the same topic and context
+            fast_generation: Write each post in one structured LLM call
+                instead of running the strategist and writer crew
+            stream_generation: Print the strategy and draft as they are
+                written and stop early if the draft drifts off-topic
+            variants: Write this many candidates in one request and post
+                the one that ranks best locally
+            reuse_drafts: Post a recent draft written for another account on
+                the same topic instead of generating a new one
         """
         self.config_dir = Path(config_dir)
+        self.debug_capture = debug_capture
         self.credentials_path = self.config_dir / "credentials.json"
-        self.content_generator = ContentGenerator()
-        self.linkedin_poster = LinkedInPoster(str(self.credentials_path))
+        self.use_content_cache = use_content_cache
+        self.fast_generation = fast_generation
+        self.stream_generation = stream_generation
+        self.variants = variants
+        self.reuse_drafts = reuse_drafts
+        # Every generated and published post, to catch repeats and reuse drafts across accounts
+        self.post_history = PostHistory(self.config_dir / "post_history.db")
+        # Stage reached by each job, so retries resume instead of regenerating or reposting
+        self.checkpoints = JobCheckpoints(self.config_dir / "checkpoints.db")
+        self.content_cache = ContentCache(self.config_dir / "content_cache.db")
+        self.content_generator = ContentGenerator(cache=self.content_cache)
+        # Filled in the background by the scheduler so due posts skip the LLM
+        self.content_bank = ContentBank(self.content_generator, fast=fast_generation)
+        # Long-lived contexts so repeated posts skip the browser launch and login form
+        self.browser_pool = BrowserContextPool(
+            self.config_dir / "sessions",
+            headless=fast_mode,
+            resource_blocker=ResourceBlocker() if fast_mode else None
+        )
+        self.selector_resolver = SelectorResolver(self.config_dir / "selector_ranking.json")
+        self.image_preprocessor = ImagePreprocessor(self.config_dir / "image_cache")
         # Default test content
         self.test_content = {
             "content": """🤖 Exploring AI Agents: The Future of Automation
@@ -55,13 +125,24 @@ Have you implemented AI agents in your workflow? Share your experience!
             "status": "success"
         }
 
+    def _create_poster(self, job_id: str) -> LinkedInPoster:
+        """Create a poster that leases its browser context from the shared pool."""
+        return LinkedInPoster(
+            str(self.credentials_path),
+            self.browser_pool,
+            selector_resolver=self.selector_resolver,
+            trace=TraceRecorder(job_id, self.config_dir / "traces", self.debug_capture)
+        )
+
     async def post_content(
         self, 
         topic: str, 
         user_id: str, 
         image_path: Optional[str] = None,
         additional_context: Optional[Dict] = None,
-        generate_new_content: bool = True
+        generate_new_content: bool = True,
+        job_key: Optional[str] = None,
+        max_attempts: int = 3
     ) -> bool:
         """
         Generate and post content to LinkedIn.
@@ -72,103 +153,517 @@ Have you implemented AI agents in your workflow? Share your experience!
             image_path: Optional path to image file
             additional_context: Optional additional context for content generation
             generate_new_content: If False, uses default test content instead of generating new content
+            job_key: Stable ID of the job; a job already posted under this key
+                is not posted again, and an unfinished one resumes where it stopped
+            max_attempts: Attempts before giving up, with exponential backoff between them
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            if generate_new_content:
-                console.print(f"[bold blue]Generating content for topic: {topic}[/bold blue]")
-                content_result = self.content_generator.generate_content(topic, additional_context)
-                
-                # Clean the content
-                content = str(content_result["content"])
-                # Remove any JSON-like formatting
-                if content.strip().startswith("{"):
-                    try:
-                        import json
-                        parsed = json.loads(content)
-                        if isinstance(parsed, dict):
-                            content = parsed.get("post_content", content)
-                    except:
-                        pass
-                
-                # Clean up any remaining artifacts
-                content = (content
-                          .replace('```json', '')
-                          .replace('```', '')
-                          .replace('"post_content":', '')
-                          .replace('"hashtags":', '')
-                          .strip())
-                
-                content_result["content"] = content
-            else:
-                console.print("[bold yellow]Using test content[/bold yellow]")
-                content_result = self.test_content
+            await self._publish_with_retries(
+                topic, user_id, image_path, additional_context, generate_new_content, job_key, max_attempts
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Error in post_content: {str(e)}")
+            console.print(f"[bold red]Error: {str(e)}[/bold red]")
+            return False
+
+    async def _publish_with_retries(
+        self,
+        topic: str,
+        user_id: str,
+        image_path: Optional[str],
+        additional_context: Optional[Dict],
+        generate_new_content: bool,
+        job_key: Optional[str] = None,
+        max_attempts: int = 3,
+        slot: Optional[asyncio.Semaphore] = None
+    ) -> PostResult:
+        """
+        Run _publish until it succeeds, resuming each retry from the job's checkpoint.
+
+        Without a job_key the job gets a random one, so only retries within
+        this call can resume it; pass a stable key to resume after a crash.
+        When a slot is given it is held for each attempt but released while
+        waiting to retry, so a failing job does not hold up others.
+        """
+        job_key = job_key or f"{user_id}-{uuid.uuid4().hex}"
+        for attempt in range(1, max_attempts + 1):
+            try:
+                async with slot or contextlib.nullcontext():
+                    return await self._publish(
+                        topic, user_id, image_path, additional_context, generate_new_content, job_key
+                    )
+            except UnconfirmedPostError:
+                # Retrying could post twice; leave it for the operator to check
+                self.checkpoints.record_failure(job_key, "Post could not be confirmed")
+                raise
+            except Exception as e:
+                attempts = self.checkpoints.record_failure(job_key, str(e))
+                if attempt == max_attempts:
+                    raise
+                delay = RETRY_BASE_SECONDS * 2 ** (attempt - 1) * random.uniform(0.8, 1.2)
+                logger.warning(f"Job {job_key} failed (attempt {attempts}): {str(e)}; retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+
+    async def _prepare_content(
+        self,
+        topic: str,
+        user_id: str,
+        additional_context: Optional[Dict],
+        generate_new_content: bool,
+        job_key: str
+    ) -> Dict:
+        """Resume, take banked content or generate it, raising if generation failed."""
+        checkpoint = self.checkpoints.load(job_key)
+        if reached(checkpoint, "sanitized"):
+            console.print(f"[bold blue]Resuming job {job_key} with its checkpointed content[/bold blue]")
+            return checkpoint["content"]
+
+        banked = reusable = None
+        if generate_new_content and not additional_context and not reached(checkpoint, "generated"):
+            banked = self.content_bank.take(user_id, topic)
+            if not banked and self.reuse_drafts:
+                reusable = self.post_history.find_reusable(topic, user_id)
+        if reached(checkpoint, "generated"):
+            content_result = checkpoint["content"]
+        elif banked:
+            console.print(f"[bold blue]Using pre-generated content for topic: {topic}[/bold blue]")
+            content_result = banked
+        elif reusable:
+            console.print(f"[bold blue]Reusing draft {reusable['id']} from {reusable['user_id']}[/bold blue]")
+            content_result = {"status": "success", "content": reusable["content"], "reused_from": reusable["id"]}
+        elif generate_new_content and self.variants > 1:
+            console.print(f"[bold blue]Generating {self.variants} variants for topic: {topic}[/bold blue]")
+            content_result = await asyncio.to_thread(
+                self.content_generator.generate_variants,
+                topic,
+                self.variants,
+                self.post_history.recent(user_id),
+                additional_context
+            )
+        elif generate_new_content and self.stream_generation:
+            console.print(f"[bold blue]Streaming content for topic: {topic}[/bold blue]")
+            content_result = await self._stream_content(topic, additional_context)
+        elif generate_new_content:
+            console.print(f"[bold blue]Generating content for topic: {topic}[/bold blue]")
+            # Crew kickoff blocks, so keep it off the event loop shared with other accounts
+            content_result = await asyncio.to_thread(
+                self.content_generator.generate_content,
+                topic,
+                additional_context,
+                self.use_content_cache,
+                self.fast_generation
+            )
+        else:
+            console.print("[bold yellow]Using test content[/bold yellow]")
+            content_result = self.test_content
 
+        if content_result["status"] == "error":
+            raise Exception(f"Content generation failed: {content_result['error']}")
+        self.checkpoints.save(job_key, "generated", user_id, topic, content_result)
+        if generate_new_content:
+            content_result = await self._check_history(topic, user_id, additional_context, content_result)
+        self.checkpoints.save(job_key, "sanitized", content=content_result)
+        return content_result
+
+    async def _check_history(
+        self,
+        topic: str,
+        user_id: str,
+        additional_context: Optional[Dict],
+        content_result: Dict
+    ) -> Dict:
+        """Regenerate once if the draft repeats this account's posts, then record it."""
+        duplicate = self.post_history.check(content_result["content"], user_id)
+        if duplicate:
+            console.print(
+                f"[bold yellow]Draft repeats post {duplicate.post_id} "
+                f"({duplicate.similarity:.0%} similar), regenerating[/bold yellow]"
+            )
+            # A cache hit is the usual cause, so go straight to the LLM
+            content_result = await asyncio.to_thread(
+                self.content_generator.generate_content,
+                topic,
+                additional_context,
+                False,
+                self.fast_generation
+            )
             if content_result["status"] == "error":
                 raise Exception(f"Content generation failed: {content_result['error']}")
+            duplicate = self.post_history.check(content_result["content"], user_id)
+            if duplicate:
+                raise Exception(f"Draft repeats post {duplicate.post_id} ({duplicate.similarity:.0%} similar)")
+        content_result["history_id"] = self.post_history.add(content_result["content"], user_id, topic)
+        return content_result
 
-            # Login to LinkedIn
-            console.print(f"[bold blue]Logging in as user: {user_id}[/bold blue]")
-            login_success = await self.linkedin_poster.login(user_id)
-            
-            if not login_success:
-                raise Exception("LinkedIn login failed")
-
-            # Create post
-            console.print("[bold blue]Creating LinkedIn post[/bold blue]")
-            post_success = await self.linkedin_poster.create_post(
-                content_result["content"],
-                image_path
+    async def _stream_content(self, topic: str, additional_context: Optional[Dict]) -> Dict:
+        """Print generation as it streams, aborting once the draft is off-topic."""
+        stream = self.content_generator.stream_content(topic, additional_context, self.use_content_cache)
+        stage = None
+        draft = ""
+        try:
+            async for event in stream:
+                if event.result:
+                    return event.result
+                if event.final:
+                    console.print()
+                    continue
+                if event.stage != stage:
+                    stage = event.stage
+                    console.print(f"[bold magenta]{stage.title()}[/bold magenta]")
+                console.print(event.text, end="", markup=False, highlight=False)
+                if stage == "writing":
+                    draft += event.text
+                    if is_off_topic(topic, draft):
+                        return {"status": "error", "error": "Draft went off-topic, generation stopped early"}
+        finally:
+            # Closes the open response so an abandoned draft stops costing tokens
+            await stream.aclose()
+        return {"status": "error", "error": "Stream ended without a result"}
+
+    async def _prepare_and_login(
+        self,
+        linkedin_poster: LinkedInPoster,
+        topic: str,
+        user_id: str,
+        additional_context: Optional[Dict],
+        generate_new_content: bool,
+        job_key: str
+    ) -> Dict:
+        """
+        Generate content and log in at the same time.
+
+        If generation fails, login is cancelled. If login fails, generation
+        is left to finish so its checkpoint spares the retry another LLM run.
+
+        Returns:
+            The prepared content result once both sides have succeeded
+        """
+        console.print(f"[bold blue]Logging in as user: {user_id}[/bold blue]")
+        generation = asyncio.create_task(
+            self._prepare_content(topic, user_id, additional_context, generate_new_content, job_key)
+        )
+        login = asyncio.create_task(linkedin_poster.login(user_id))
+        pending = {generation, login}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if generation in done:
+                    generation.result()
+                if login in done and (login.exception() or not login.result()):
+                    if generation in pending:
+                        console.print("[bold yellow]Login failed, saving the content being generated for the retry[/bold yellow]")
+                        await asyncio.gather(generation, return_exceptions=True)
+                        pending.discard(generation)
+                    raise login.exception() or Exception("LinkedIn login failed")
+            # Saved only once both are done, so this stage also implies sanitized content
+            self.checkpoints.save(job_key, "logged_in")
+            return generation.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _publish(
+        self,
+        topic: str,
+        user_id: str,
+        image_path: Optional[str],
+        additional_context: Optional[Dict],
+        generate_new_content: bool,
+        job_key: str
+    ) -> PostResult:
+        """Generate and post content, raising on any failure."""
+        checkpoint = self.checkpoints.load(job_key)
+        if reached(checkpoint, "posted"):
+            console.print(f"[bold yellow]Job {job_key} was already posted: {checkpoint['post_urn']}[/bold yellow]")
+            return PostResult(True, post_urn=checkpoint["post_urn"])
+
+        job_id = f"{user_id}-{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        linkedin_poster = self._create_poster(job_id)
+        # Resize the attachment while content is generated and the browser logs in
+        image_task = asyncio.create_task(self._prepare_image(image_path)) if image_path else None
+        try:
+            content_result = await self._prepare_and_login(
+                linkedin_poster, topic, user_id, additional_context, generate_new_content, job_key
             )
+            if image_task:
+                image_path = await image_task
 
-            if post_success:
-                console.print("[bold green]Post created successfully![/bold green]")
-                return True
+            if reached(checkpoint, "posting"):
+                post_result = await self._confirm_earlier_post(linkedin_poster, content_result, job_key)
             else:
-                raise Exception("Failed to create post")
+                post_result = None
 
-        except Exception as e:
-            logger.error(f"Error in post_content: {str(e)}")
-            console.print(f"[bold red]Error: {str(e)}[/bold red]")
-            return False
+            if not post_result:
+                # Create post
+                console.print("[bold blue]Creating LinkedIn post[/bold blue]")
+                post_result = await linkedin_poster.create_post(
+                    content_result["content"],
+                    image_path,
+                    on_submit=lambda: self.checkpoints.save(job_key, "posting")
+                )
+
+            if not post_result:
+                raise Exception(f"Failed to create post: {post_result.error}")
+            self.checkpoints.save(job_key, "posted", post_urn=post_result.post_urn)
+            if "history_id" in content_result:
+                self.post_history.mark_published(content_result["history_id"], post_result.post_urn)
+            console.print(
+                f"[bold green]Post created successfully for {user_id}: {post_result.post_urn}[/bold green]"
+            )
+            return post_result
 
         finally:
-            await self.linkedin_poster.close()
+            if image_task and not image_task.done():
+                image_task.cancel()
+            await linkedin_poster.close()
+
+    async def _confirm_earlier_post(
+        self,
+        linkedin_poster: LinkedInPoster,
+        content_result: Dict,
+        job_key: str
+    ) -> Optional[PostResult]:
+        """
+        Check whether an earlier attempt's unconfirmed click published the post.
+
+        Returns:
+            PostResult if it did, None if it is safe to post again
+        """
+        console.print(f"[bold yellow]Job {job_key} clicked post without confirmation, checking the feed[/bold yellow]")
+        try:
+            post_urn = await linkedin_poster.find_recent_post(content_result["content"])
+        except Exception as e:
+            raise UnconfirmedPostError(f"Could not check whether job {job_key} was posted: {str(e)}")
+        if post_urn:
+            return PostResult(True, post_urn=post_urn)
+        # The check left the browser on the activity page; posting starts from the feed
+        await linkedin_poster.open_feed()
+        return None
+
+    async def _prepare_image(self, image_path: str) -> str:
+        """Preprocess an attachment, falling back to the original file on error."""
+        try:
+            return await self.image_preprocessor.prepare(image_path)
+        except Exception as e:
+            logger.error(f"Image preprocessing failed, using original: {str(e)}")
+            return image_path
+
+    async def post_many(
+        self,
+        jobs: List,
+        max_concurrency: int = 5,
+        generate_new_content: bool = True,
+        max_attempts: int = 3,
+        job_key: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Post for several accounts concurrently in one event loop.
+
+        Each user gets its own browser context from the pool; jobs for the
+        same user run one after another.
+        
+        Args:
+            jobs: List of (user_id, topic, image_path) tuples or dicts with
+                "user_id", "topic" and optional "image" and "job_key" keys
+            max_concurrency: Maximum number of jobs running at once
+            generate_new_content: If False, uses default test content instead of generating new content
+            max_attempts: Attempts per job before giving up
+            job_key: Stable ID of the batch; jobs without their own key use
+                it with their index, so rerunning the batch resumes it
+            
+        Returns:
+            List of per-job result dicts in the same order as jobs
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        self.browser_pool.max_contexts = max(self.browser_pool.max_contexts, max_concurrency)
+
+        async def run_job(index: int, job) -> Dict:
+            if isinstance(job, dict):
+                user_id, topic, image_path = job["user_id"], job["topic"], job.get("image")
+                key = job.get("job_key")
+            else:
+                user_id, topic, image_path = (tuple(job) + (None,))[:3]
+                key = None
+            key = key or (f"{job_key}-{index}" if job_key else None)
+
+            result = {
+                "index": index,
+                "user_id": user_id,
+                "topic": topic,
+                "image": image_path
+            }
+            started = time.monotonic()
+            try:
+                post_result = await self._publish_with_retries(
+                    topic, user_id, image_path, None, generate_new_content, key, max_attempts, slot=semaphore
+                )
+                result["status"] = "success"
+                result["post_urn"] = post_result.post_urn
+                result["timings"] = post_result.timings
+            except Exception as e:
+                logger.error(f"Job {index} for {user_id} failed: {str(e)}")
+                result["status"] = "error"
+                result["error"] = str(e)
+            result["duration"] = round(time.monotonic() - started, 2)
+            return result
+
+        results = await asyncio.gather(*(run_job(i, job) for i, job in enumerate(jobs)))
+        succeeded = sum(1 for r in results if r["status"] == "success")
+        console.print(f"[bold blue]Posted {succeeded}/{len(results)} jobs[/bold blue]")
+        return list(results)
+
+    async def shutdown(self):
+        """Close the shared browser pool and image workers and report cache use."""
+        await self.browser_pool.close()
+        await asyncio.to_thread(self.image_preprocessor.close)
+        logger.info(f"Content cache stats: {self.content_cache.stats()}")
+        logger.info(f"Generation stats by mode: {self.content_generator.mode_report()}")
+        logger.info(f"Content bank stats: {self.content_bank.stats}")
+
+async def post_once(automation: LinkedInAutomation, *args, **kwargs) -> bool:
+    """Post in a fresh event loop and close the browser pool before it ends."""
+    try:
+        return await automation.post_content(*args, **kwargs)
+    finally:
+        await automation.shutdown()
 
-def schedule_post(automation: LinkedInAutomation, topic: str, user_id: str, time_str: str):
-    """Schedule a post for a specific time."""
-    schedule.every().day.at(time_str).do(
-        lambda: asyncio.run(automation.post_content(topic, user_id))
+async def post_batch(automation: LinkedInAutomation, *args, **kwargs) -> List[Dict]:
+    """Run post_many in a fresh event loop and close the browser pool before it ends."""
+    try:
+        return await automation.post_many(*args, **kwargs)
+    finally:
+        await automation.shutdown()
+
+async def run_scheduler(automation: LinkedInAutomation, scheduler: PostScheduler, max_attempts: int = 3):
+    """
+    Run scheduled jobs in one long-lived event loop, sharing the browser pool.
+
+    Every pending job is registered with the content bank, whose producer
+    fills it ahead of the due time, so a job only waits on the LLM when its
+    queue ran dry.
+    """
+    bank = automation.content_bank
+    for job in scheduler.list_jobs():
+        bank.register(job["user_id"], job["topic"], needed_at=job["run_at"])
+    # Daily jobs queue their next run after each post; bank that one too
+    scheduler.on_scheduled = lambda user_id, topic, run_at: bank.register(user_id, topic, run_at)
+    scheduler.runner = lambda job: automation.post_content(
+        job["topic"], job["user_id"], job["image_path"],
+        job_key=f"scheduled-{job['id']}", max_attempts=max_attempts
     )
+    producer = asyncio.create_task(bank.run())
+    try:
+        await scheduler.run_forever()
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        await automation.shutdown()
+        scheduler.close()
+
+def print_jobs(scheduler: PostScheduler):
+    """Print pending scheduled jobs."""
+    jobs = scheduler.list_jobs()
+    if not jobs:
+        console.print("[bold yellow]No pending jobs[/bold yellow]")
+    for job in jobs:
+        repeat = f"daily at {job['time_of_day']}" if job["time_of_day"] else "once"
+        console.print(
+            f"[bold]{job['id']}[/bold] {datetime.fromtimestamp(job['run_at']):%Y-%m-%d %H:%M:%S} "
+            f"{job['user_id']} \"{job['topic']}\" ({repeat})"
+        )
 
 def main():
     parser = argparse.ArgumentParser(description="LinkedIn Content Automation")
-    parser.add_argument("--topic", required=True, help="Topic for the LinkedIn post")
-    parser.add_argument("--user", required=True, help="User ID from credentials to post as")
+    parser.add_argument("--topic", help="Topic for the LinkedIn post")
+    parser.add_argument("--user", help="User ID from credentials to post as")
     parser.add_argument("--image", help="Path to image file to include in post")
-    parser.add_argument("--schedule", help="Time to schedule post (HH:MM format)")
+    parser.add_argument("--schedule", help="Time to schedule a daily post (HH:MM format) and run the scheduler")
+    parser.add_argument("--jitter", type=float, default=0, help="Random delay of up to this many seconds added to scheduled runs")
+    parser.add_argument("--run-scheduler", action="store_true", help="Run pending scheduled jobs")
+    parser.add_argument("--list-jobs", action="store_true", help="List pending scheduled jobs")
+    parser.add_argument("--cancel-job", type=int, help="Cancel a pending scheduled job by ID")
     parser.add_argument("--config", default="config", help="Path to config directory")
     parser.add_argument("--test", action="store_true", help="Use test content instead of generating new content")
+    parser.add_argument("--debug-capture", action="store_true", help="Keep recent DOM snapshots and screenshots for failure traces")
+    parser.add_argument("--fast", action="store_true", help="Run headless and block images, fonts, media and trackers")
+    parser.add_argument("--fast-generation", action="store_true", help="Write each post in one structured LLM call instead of the full crew")
+    parser.add_argument("--stream", action="store_true", help="Print the post as it is generated and stop early if it goes off-topic")
+    parser.add_argument("--variants", type=int, default=1, help="Write this many candidate posts in one request and post the best")
+    parser.add_argument("--reuse-drafts", action="store_true", help="Post a recent draft written for another account on the same topic instead of generating")
+    parser.add_argument("--no-cache", action="store_true", help="Always generate fresh content instead of reusing cached results")
+    parser.add_argument("--jobs", help="JSON file with a list of {user_id, topic, image} jobs to post concurrently")
+    parser.add_argument("--retries", type=int, default=3, help="Attempts per post before giving up; retries resume from the last completed stage")
+    parser.add_argument("--job-key", help="Stable ID for this post or batch; rerunning with the same key after a crash resumes the job instead of posting again")
+    parser.add_argument("--concurrency", type=int, default=5, help="Maximum number of jobs posted at once with --jobs")
     
     args = parser.parse_args()
+    scheduler_only = args.run_scheduler or args.list_jobs or args.cancel_job is not None
+    if not (args.jobs or scheduler_only) and not (args.topic and args.user):
+        parser.error("--topic and --user are required unless --jobs or a scheduler option is given")
+
+    if args.list_jobs or args.cancel_job is not None:
+        scheduler = PostScheduler(Path(args.config) / "scheduler.db")
+        if args.cancel_job is not None:
+            if scheduler.cancel_job(args.cancel_job):
+                console.print(f"[bold green]Cancelled job {args.cancel_job}[/bold green]")
+            else:
+                console.print(f"[bold red]No pending job {args.cancel_job}[/bold red]")
+        if args.list_jobs:
+            print_jobs(scheduler)
+        scheduler.close()
+        return
     
-    automation = LinkedInAutomation(args.config)
+    automation = LinkedInAutomation(
+        args.config,
+        debug_capture=args.debug_capture,
+        fast_mode=args.fast,
+        use_content_cache=not args.no_cache,
+        fast_generation=args.fast_generation,
+        stream_generation=args.stream,
+        variants=args.variants,
+        reuse_drafts=args.reuse_drafts
+    )
 
-    if args.schedule:
-        console.print(f"[bold blue]Scheduling post for {args.schedule}[/bold blue]")
-        schedule_post(automation, args.topic, args.user, args.schedule)
-        
-        while True:
-            schedule.run_pending()
-            time.sleep(60)
+    if args.jobs:
+        with open(args.jobs) as f:
+            jobs = json.load(f)
+        results = asyncio.run(post_batch(
+            automation,
+            jobs,
+            max_concurrency=args.concurrency,
+            generate_new_content=not args.test,
+            max_attempts=args.retries,
+            job_key=args.job_key
+        ))
+        for result in results:
+            status = "green" if result["status"] == "success" else "red"
+            console.print(
+                f"[{status}]{result['user_id']}: {result['status']} "
+                f"in {result['duration']}s {result.get('error', '')}[/{status}]"
+            )
+    elif args.schedule or args.run_scheduler:
+        scheduler = PostScheduler(Path(args.config) / "scheduler.db")
+        if args.schedule:
+            console.print(f"[bold blue]Scheduling post for {args.schedule}[/bold blue]")
+            scheduler.add_job(args.user, args.topic, time_of_day=args.schedule,
+                              image_path=args.image, jitter=args.jitter)
+        print_jobs(scheduler)
+        asyncio.run(run_scheduler(automation, scheduler, max_attempts=args.retries))
     else:
-        asyncio.run(automation.post_content(
+        asyncio.run(post_once(
+            automation,
             args.topic, 
             args.user, 
             args.image, 
-            generate_new_content=not args.test
+            generate_new_content=not args.test,
+            job_key=args.job_key,
+            max_attempts=args.retries
         ))
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+import json
+import re
+from typing import List
+
+# LinkedIn rejects posts over 3000 characters and buries posts with many hashtags
+LINKEDIN_MAX_CHARS = 3000
+MAX_HASHTAGS = 5
+
+_FENCE = re.compile(r"^\s*```")
+# Everything that can only appear at the start of a line, matched in one go
+_LINE_PREFIX = re.compile(
+    r"^(?:(?P<fence>\s*```)"
+    r"|(?P<heading>\s{0,3}#{1,6}\s+)"
+    r"|(?P<indent>\s*)(?P<bullet>[-*+]\s+)"
+    r'|(?P<label>\s*"?post_content"?\s*:\s*"?)'
+    r'|(?P<header>\s*(?:relevant\s+)?"?hashtags"?\s*(?::|$)\s*))',
+    re.IGNORECASE
+)
+_INLINE_MARKERS = ("*", "_", "`", "[", "hashtag#", "Hashtag#")
+_HASHTAG = re.compile(r"#\w+")
+_HASHTAG_LINE = re.compile(r'^[\s,"\[\]]*(?:#\w+[\s,"\[\]]*)+$')
+_INLINE = re.compile(
+    r"(?P<prefix>hashtag#)"
+    r"|\*\*(?P<bold>.+?)\*\*"
+    r"|__(?P<underline>.+?)__"
+    r"|(?<![\w*])\*(?P<italic>[^\s*](?:[^*]*?[^\s*])?)\*(?![\w*])"
+    r"|`(?P<code>[^`]+)`"
+    r"|\[(?P<text>[^\]]+)\]\((?P<url>[^)\s]+)\)",
+    re.IGNORECASE
+)
+
+
+def _inline(match: re.Match) -> str:
+    if match.group("prefix"):
+        return "#"
+    if match.group("url"):
+        return f"{_INLINE.sub(_inline, match.group('text'))} ({match.group('url')})"
+    inner = match.group("bold") or match.group("underline") or match.group("italic") or match.group("code")
+    return _INLINE.sub(_inline, inner)
+
+
+def _unwrap_json(text: str) -> str:
+    """Pull the post out of a JSON object like {"post_content": ..., "hashtags": [...]}."""
+    try:
+        parsed = json.loads(text, strict=False)
+    except ValueError:
+        return text
+    if not isinstance(parsed, dict):
+        return text
+    body = next((parsed[k] for k in ("post_content", "content", "post", "body") if isinstance(parsed.get(k), str)), None)
+    if body is None:
+        return text
+    hashtags = parsed.get("hashtags") or []
+    if isinstance(hashtags, list):
+        hashtags = " ".join(f"#{str(tag).lstrip('#')}" for tag in hashtags)
+    return f"{body}\n\n{hashtags}" if hashtags else body
+
+
+def _truncate(body: str, limit: int) -> str:
+    if len(body) <= limit:
+        return body
+    cut = body[:max(limit - 1, 0)]
+    space = cut.rfind(" ")
+    if space > limit * 0.8:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+def clean_post(
+    text: str,
+    max_chars: int = LINKEDIN_MAX_CHARS,
+    max_hashtags: int = MAX_HASHTAGS
+) -> str:
+    """
+    Turn raw LLM output into a post that can be pasted into LinkedIn.
+
+    In one pass over the lines this unwraps JSON, drops code fences and
+    "Relevant Hashtags:" style headers, strips markdown emphasis, headings,
+    inline code and links, turns list markers into bullets and fixes the
+    'hashtag#' prefix. Hashtag-only lines are gathered into a single,
+    de-duplicated closing line of at most max_hashtags tags, and the body is
+    cut at a word boundary so the whole post fits in max_chars.
+
+    Args:
+        text: Raw post text from the writer or cleaner stage
+        max_chars: Character limit for the whole post
+        max_hashtags: Maximum number of closing hashtags
+
+    Returns:
+        The cleaned post
+    """
+    text = str(text).replace("\r\n", "\n").strip()
+    if text.startswith("```"):
+        text = "\n".join(line for line in text.split("\n") if not _FENCE.match(line)).strip()
+    # Output that looks like JSON but does not parse keeps its quotes and commas
+    json_leftovers = False
+    if text.startswith("{"):
+        unwrapped = _unwrap_json(text)
+        json_leftovers = unwrapped is text
+        text = unwrapped
+
+    lines: List[str] = []
+    hashtags: List[str] = []
+    seen = set()
+    blank = False
+    for line in text.split("\n"):
+        prefix = _LINE_PREFIX.match(line)
+        leftover = json_leftovers
+        if prefix:
+            kind = prefix.lastgroup
+            if kind == "fence":
+                continue
+            leftover = leftover or kind == "label"
+            if kind == "bullet":
+                line = prefix.group("indent") + "• " + line[prefix.end():]
+            else:
+                line = line[prefix.end():]
+        if any(marker in line for marker in _INLINE_MARKERS):
+            line = _INLINE.sub(_inline, line)
+        line = line.rstrip()
+        if leftover:
+            line = line.rstrip('",')
+
+        if "#" in line and _HASHTAG_LINE.match(line):
+            for tag in _HASHTAG.findall(line):
+                if tag.lower() not in seen:
+                    seen.add(tag.lower())
+                    hashtags.append(tag)
+            continue
+        if not line.strip():
+            blank = bool(lines)
+            continue
+        if blank:
+            lines.append("")
+            blank = False
+        lines.append(line)
+
+    tail = " ".join(hashtags[:max_hashtags])
+    body = "\n".join(lines)
+    if tail:
+        body = _truncate(body, max_chars - len(tail) - 2)
+        return f"{body}\n\n{tail}" if body else tail
+    return _truncate(body, max_chars)
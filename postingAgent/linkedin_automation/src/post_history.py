@@ -0,0 +1,196 @@
+import logging
+import re
+import sqlite3
+import time
+import zlib
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from content_cache import normalize_topic
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    content TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'generated',
+    post_urn TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_topic ON posts (topic, created_at);
+"""
+
+# 64 bins split into 16 bands of 4 make pairs above ~0.5 Jaccard likely candidates
+NUM_BINS = 64
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"\w+")
+_EMPTY = 0xFFFFFFFF
+
+
+def signature(text: str) -> array:
+    """
+    One-permutation MinHash signature of the text's word 3-grams.
+
+    Each shingle is hashed once and kept as the minimum of its bin, so the
+    cost is one crc32 per shingle rather than one per permutation. Empty bins
+    borrow the next non-empty bin's value so short posts stay comparable.
+    """
+    words = _WORD.findall(text.lower())
+    bins = array("Q", [_EMPTY] * NUM_BINS)
+    for i in range(max(len(words) - SHINGLE_SIZE + 1, 1)):
+        value = zlib.crc32(" ".join(words[i:i + SHINGLE_SIZE]).encode())
+        index, value = value % NUM_BINS, value // NUM_BINS
+        if value < bins[index]:
+            bins[index] = value
+    filled = [i for i, value in enumerate(bins) if value != _EMPTY]
+    if filled and len(filled) < NUM_BINS:
+        for i in range(NUM_BINS):
+            if bins[i] == _EMPTY:
+                source = next((j for j in filled if j > i), filled[0])
+                bins[i] = bins[source] + (i - source) % NUM_BINS * 0x10000000
+    return bins
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_BINS
+
+
+def _band_keys(sig: array) -> List[Tuple[int, Tuple[int, ...]]]:
+    return [(band, tuple(sig[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+
+
+@dataclass
+class HistoryMatch:
+    """A prior post that a draft nearly duplicates."""
+    post_id: int
+    user_id: str
+    topic: str
+    status: str
+    similarity: float
+
+
+class PostHistory:
+    def __init__(self, db_path: str, threshold: float = 0.7, reuse_max_age: float = 7 * 86400):
+        """
+        Initialize the index of generated and published posts.
+
+        Signatures are stored in SQLite and held in memory with their LSH
+        buckets, so a check is a handful of dict lookups.
+
+        Args:
+            db_path: Path to the SQLite database file
+            threshold: Estimated Jaccard similarity at which drafts count as duplicates
+            reuse_max_age: Oldest draft, in seconds, offered for reuse by another account
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.reuse_max_age = reuse_max_age
+        self.db = sqlite3.connect(str(self.db_path))
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+        self._signatures: Dict[int, array] = {}
+        self._meta: Dict[int, Tuple[str, str, str]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        for row in self.db.execute("SELECT id, user_id, topic, status, signature FROM posts"):
+            sig = array("Q")
+            sig.frombytes(row["signature"])
+            self._index(row["id"], sig, row["user_id"], row["topic"], row["status"])
+
+    def _index(self, post_id: int, sig: array, user_id: str, topic: str, status: str):
+        self._signatures[post_id] = sig
+        self._meta[post_id] = (user_id, topic, status)
+        for key in _band_keys(sig):
+            self._buckets.setdefault(key, []).append(post_id)
+
+    def check(
+        self,
+        text: str,
+        user_id: Optional[str] = None,
+        status: Optional[str] = "published"
+    ) -> Optional[HistoryMatch]:
+        """
+        Return the closest prior post the text nearly duplicates, if any.
+
+        Args:
+            text: Draft to check
+            user_id: Only compare with this account's posts
+            status: Only compare with posts in this status; None for all
+
+        Returns:
+            The best HistoryMatch at or above the threshold, or None
+        """
+        sig = signature(text)
+        candidates = {post_id for key in _band_keys(sig) for post_id in self._buckets.get(key, ())}
+        best = None
+        for post_id in candidates:
+            owner, topic, post_status = self._meta[post_id]
+            if (user_id and owner != user_id) or (status and post_status != status):
+                continue
+            score = similarity(sig, self._signatures[post_id])
+            if score >= self.threshold and (not best or score > best.similarity):
+                best = HistoryMatch(post_id, owner, topic, post_status, score)
+        return best
+
+    def add(self, text: str, user_id: str, topic: str, status: str = "generated") -> int:
+        """Record a post and return its ID."""
+        sig = signature(text)
+        cursor = self.db.execute(
+            "INSERT INTO posts (user_id, topic, content, signature, status, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (user_id, normalize_topic(topic), text, sig.tobytes(), status, time.time())
+        )
+        self.db.commit()
+        self._index(cursor.lastrowid, sig, user_id, normalize_topic(topic), status)
+        return cursor.lastrowid
+
+    def mark_published(self, post_id: int, post_urn: Optional[str] = None):
+        """Mark a recorded draft as published."""
+        self.db.execute(
+            "UPDATE posts SET status = 'published', post_urn = ? WHERE id = ?", (post_urn, post_id)
+        )
+        self.db.commit()
+        user_id, topic, _ = self._meta[post_id]
+        self._meta[post_id] = (user_id, topic, "published")
+
+    def recent(self, user_id: str, limit: int = 20) -> List[str]:
+        """Return an account's latest published posts, newest first."""
+        rows = self.db.execute(
+            "SELECT content FROM posts WHERE user_id = ? AND status = 'published' "
+            "ORDER BY created_at DESC LIMIT ?",
+            (user_id, limit)
+        )
+        return [row["content"] for row in rows]
+
+    def find_reusable(self, topic: str, user_id: str) -> Optional[Dict]:
+        """
+        Find a recent draft on the same topic written for another account.
+
+        Drafts this account already posted something close to are skipped.
+
+        Returns:
+            Dict with the draft's "id", "user_id" and "content", or None
+        """
+        rows = self.db.execute(
+            "SELECT id, user_id, content FROM posts WHERE topic = ? AND user_id != ? AND created_at > ? "
+            "ORDER BY created_at DESC LIMIT 20",
+            (normalize_topic(topic), user_id, time.time() - self.reuse_max_age)
+        )
+        for row in rows:
+            if not self.check(row["content"], user_id=user_id, status=None):
+                return dict(row)
+        return None
+
+    def close(self):
+        """Close the history database."""
+        self.db.close()
@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    image_path TEXT,
+    time_of_day TEXT,
+    run_at REAL NOT NULL,
+    jitter REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL
+)
+"""
+
+
+# A job interrupted by this many restarts is given up as failed
+MAX_INTERRUPTED_RUNS = 3
+
+
+def next_daily_run(time_str: str, after: Optional[datetime] = None) -> datetime:
+    """Return the next local datetime matching HH:MM strictly after `after`."""
+    after = after or datetime.now()
+    hour, minute = (int(part) for part in time_str.split(":"))
+    candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= after:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+class PostScheduler:
+    def __init__(
+        self,
+        db_path: str,
+        runner: Optional[Callable[[Dict], Awaitable[bool]]] = None,
+        catch_up_window: float = 3600,
+        max_concurrency: int = 5,
+        per_account_limit: int = 1,
+        on_scheduled: Optional[Callable[[str, str, float], None]] = None
+    ):
+        """
+        Initialize a durable scheduler backed by a local SQLite job table.
+
+        Args:
+            db_path: Path to the SQLite database file
+            runner: Coroutine function called with the job row; returns
+                True on success
+            catch_up_window: Seconds a missed job may be late and still run
+                when the scheduler starts; older missed runs are skipped
+            max_concurrency: Maximum number of jobs running at once
+            per_account_limit: Maximum number of jobs running at once per user
+            on_scheduled: Called with (user_id, topic, run_at) whenever a
+                run is queued, e.g. to have its content generated ahead
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.db_path))
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(SCHEMA)
+        self.db.commit()
+        self.runner = runner
+        self.on_scheduled = on_scheduled
+        self.catch_up_window = catch_up_window
+        self.per_account_limit = per_account_limit
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._account_limits: Dict[str, asyncio.Semaphore] = {}
+        self._wakeup = asyncio.Event()
+        self._tasks = set()
+
+    def add_job(
+        self,
+        user_id: str,
+        topic: str,
+        run_at: Optional[datetime] = None,
+        time_of_day: Optional[str] = None,
+        image_path: Optional[str] = None,
+        jitter: float = 0
+    ) -> int:
+        """
+        Add a one-off job, or a daily job when time_of_day is given.
+
+        Adding a daily job that is already queued for the same user, topic
+        and time returns the existing job instead of a second one, so the
+        same --schedule command can be rerun after a restart.
+
+        Args:
+            user_id: ID of the user to post as
+            topic: Topic for the post
+            run_at: When a one-off job should run
+            time_of_day: HH:MM for a job that repeats every day
+            image_path: Optional path to image file
+            jitter: Up to this many seconds are added at random to each run
+
+        Returns:
+            ID of the new or existing job
+        """
+        if time_of_day:
+            existing = self.db.execute(
+                "SELECT id FROM jobs WHERE user_id = ? AND topic = ? AND time_of_day = ? "
+                "AND status IN ('pending', 'running') ORDER BY run_at LIMIT 1",
+                (user_id, topic, time_of_day)
+            ).fetchone()
+            if existing:
+                self.logger.info(f"Daily job {existing['id']} for {user_id} at {time_of_day} already exists")
+                return existing["id"]
+            run_at = next_daily_run(time_of_day)
+        if not run_at:
+            raise ValueError("Either run_at or time_of_day is required")
+        return self._insert(user_id, topic, image_path, time_of_day, run_at, jitter)
+
+    def _insert(
+        self,
+        user_id: str,
+        topic: str,
+        image_path: Optional[str],
+        time_of_day: Optional[str],
+        run_at: datetime,
+        jitter: float
+    ) -> int:
+        run_at_ts = run_at.timestamp() + random.uniform(0, jitter)
+        cursor = self.db.execute(
+            "INSERT INTO jobs (user_id, topic, image_path, time_of_day, run_at, jitter, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (user_id, topic, image_path, time_of_day, run_at_ts, jitter, time.time())
+        )
+        self.db.commit()
+        self._wakeup.set()
+        if self.on_scheduled:
+            self.on_scheduled(user_id, topic, run_at_ts)
+        self.logger.info(f"Scheduled job {cursor.lastrowid} for {user_id} at {run_at:%Y-%m-%d %H:%M}")
+        return cursor.lastrowid
+
+    def list_jobs(self, status: Optional[str] = "pending") -> List[Dict]:
+        """List jobs in run order, optionally filtered by status."""
+        if status:
+            rows = self.db.execute("SELECT * FROM jobs WHERE status = ? ORDER BY run_at", (status,))
+        else:
+            rows = self.db.execute("SELECT * FROM jobs ORDER BY run_at")
+        return [dict(row) for row in rows]
+
+    def cancel_job(self, job_id: int) -> bool:
+        """Cancel a pending job. Returns False if no such pending job exists."""
+        cursor = self.db.execute(
+            "UPDATE jobs SET status = 'cancelled' WHERE id = ? AND status = 'pending'", (job_id,)
+        )
+        self.db.commit()
+        self._wakeup.set()
+        return cursor.rowcount > 0
+
+    def _set_status(self, job_id: int, status: str, error: Optional[str] = None):
+        self.db.execute(
+            "UPDATE jobs SET status = ?, last_error = ?, attempts = attempts + ? WHERE id = ?",
+            (status, error, 1 if status in ("done", "failed") else 0, job_id)
+        )
+        self.db.commit()
+
+    def _reschedule(self, job: Dict):
+        """Queue the next occurrence of a daily job."""
+        if not job["time_of_day"]:
+            return
+        run_at = next_daily_run(job["time_of_day"], max(datetime.fromtimestamp(job["run_at"]), datetime.now()))
+        self._insert(job["user_id"], job["topic"], job["image_path"], job["time_of_day"], run_at, job["jitter"])
+
+    def catch_up(self):
+        """Handle jobs that came due while the scheduler was not running."""
+        now = time.time()
+        for job in self.list_jobs("running"):
+            # Interrupted mid-run; run it again under the same id so the runner
+            # can resume from its checkpoint and see whether it already posted
+            if job["attempts"] + 1 >= MAX_INTERRUPTED_RUNS:
+                self.logger.warning(f"Job {job['id']} was interrupted too many times, giving up")
+                self._set_status(job["id"], "failed", "Interrupted by restart")
+                self._reschedule(job)
+                continue
+            self.logger.warning(f"Job {job['id']} was interrupted while running, resuming it")
+            self.db.execute(
+                "UPDATE jobs SET status = 'pending', run_at = ?, attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (now, "Interrupted by restart", job["id"])
+            )
+            self.db.commit()
+        for job in self.list_jobs("pending"):
+            if job["run_at"] < now - self.catch_up_window:
+                self.logger.info(f"Skipping job {job['id']}, missed by more than the catch-up window")
+                self._set_status(job["id"], "missed")
+                self._reschedule(job)
+
+    async def _run_job(self, job: Dict):
+        account_limit = self._account_limits.setdefault(
+            job["user_id"], asyncio.Semaphore(self.per_account_limit)
+        )
+        async with self._semaphore, account_limit:
+            self.logger.info(f"Running job {job['id']} for {job['user_id']}: {job['topic']}")
+            try:
+                success = await self.runner(job)
+                self._set_status(job["id"], "done" if success else "failed",
+                                 None if success else "Runner reported failure")
+            except Exception as e:
+                self.logger.error(f"Job {job['id']} failed: {str(e)}")
+                self._set_status(job["id"], "failed", str(e))
+        self._reschedule(job)
+
+    async def run_forever(self):
+        """Run due jobs on time until cancelled."""
+        self.catch_up()
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            for job in self.list_jobs("pending"):
+                if job["run_at"] > now:
+                    break
+                self.db.execute("UPDATE jobs SET status = 'running' WHERE id = ?", (job["id"],))
+                self.db.commit()
+                task = asyncio.create_task(self._run_job(job))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            upcoming = self.db.execute(
+                "SELECT MIN(run_at) FROM jobs WHERE status = 'pending'"
+            ).fetchone()[0]
+            timeout = None if upcoming is None else max(upcoming - time.time(), 0)
+            try:
+                # Sleep until the next job is due or the job table changes
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def close(self):
+        """Close the job database."""
+        self.db.close()
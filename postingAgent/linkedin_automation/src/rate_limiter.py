@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Optional
+
+from humanizer import RealClock
+
+# Waits shorter than this are float rounding; sleeping them may not advance a virtual clock
+MIN_WAIT_SECONDS = 1e-9
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, clock=None):
+        """
+        Initialize a token bucket that refills continuously.
+
+        Args:
+            rate_per_minute: Tokens added per minute
+            capacity: Maximum burst size; defaults to one minute of tokens
+            clock: RealClock (default) or VirtualClock
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.clock = clock or RealClock()
+        self.tokens = self.capacity
+        self.updated = self.clock.now()
+
+    def _refill(self):
+        now = self.clock.now()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available."""
+        self._refill()
+        wait = (min(amount, self.capacity) - self.tokens) / self.rate
+        return wait if wait > MIN_WAIT_SECONDS else 0.0
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class OpenAIRateLimiter:
+    def __init__(
+        self,
+        requests_per_minute: float = 500,
+        tokens_per_minute: float = 30000,
+        clock=None
+    ):
+        """
+        Initialize a limiter shared by every concurrent generation.
+
+        Args:
+            requests_per_minute: OpenAI requests-per-minute quota
+            tokens_per_minute: OpenAI tokens-per-minute quota
+            clock: RealClock (default) or VirtualClock
+        """
+        self.logger = logging.getLogger(__name__)
+        self.clock = clock or RealClock()
+        self.requests = TokenBucket(requests_per_minute, clock=self.clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock=self.clock)
+        self._lock = asyncio.Lock()
+        self.waited = 0.0
+
+    async def acquire(self, requests: int = 1, tokens: int = 0):
+        """Wait until both quotas have room, then reserve it. Callers are served in order."""
+        async with self._lock:
+            while True:
+                delay = max(self.requests.wait_time(requests), self.tokens.wait_time(tokens))
+                if delay <= 0:
+                    break
+                self.waited += delay
+                await self.clock.sleep(delay)
+            self.requests.take(requests)
+            self.tokens.take(tokens)
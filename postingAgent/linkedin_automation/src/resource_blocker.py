@@ -0,0 +1,58 @@
+import logging
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+DEFAULT_BLOCKED_TYPES = {"image", "media", "font"}
+
+DEFAULT_BLOCKED_DOMAINS = [
+    "doubleclick.net",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "ads.linkedin.com",
+    "px.ads.linkedin.com",
+    "snap.licdn.com",
+    "bat.bing.com",
+    "facebook.net",
+]
+
+
+class ResourceBlocker:
+    def __init__(
+        self,
+        blocked_types: Optional[Iterable[str]] = None,
+        blocked_domains: Optional[Iterable[str]] = None
+    ):
+        """
+        Initialize a request filter that drops resources the poster never needs.
+
+        Args:
+            blocked_types: Playwright resource types to abort (image, font, ...)
+            blocked_domains: Hosts to abort; subdomains are matched too
+        """
+        self.logger = logging.getLogger(__name__)
+        self.blocked_types = set(DEFAULT_BLOCKED_TYPES if blocked_types is None else blocked_types)
+        self.blocked_domains = tuple(
+            d.lower().lstrip(".") for d in (DEFAULT_BLOCKED_DOMAINS if blocked_domains is None else blocked_domains)
+        )
+        self.blocked = 0
+        self.allowed = 0
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Check a request against the type and domain denylists."""
+        if resource_type in self.blocked_types:
+            return True
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == d or host.endswith("." + d) for d in self.blocked_domains)
+
+    async def install(self, context):
+        """Route every request of a browser context through the filter."""
+        await context.route("**/*", self._handle)
+
+    async def _handle(self, route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self.blocked += 1
+            await route.abort()
+        else:
+            self.allowed += 1
+            await route.continue_()
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class SelectorResolver:
+    def __init__(self, ranking_path: str, timeout: int = 5000):
+        """
+        Initialize the resolver that finds the first matching selector for a step.
+
+        Args:
+            ranking_path: JSON file remembering which selector worked per step
+            timeout: Maximum time in milliseconds to wait for any candidate
+        """
+        self.logger = logging.getLogger(__name__)
+        self.ranking_path = Path(ranking_path)
+        self.timeout = timeout
+        self.rankings = self._load_rankings()
+
+    def _load_rankings(self) -> Dict:
+        """Load saved selector rankings, starting fresh if missing or corrupt."""
+        try:
+            with open(self.ranking_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.error(f"Error loading selector rankings: {str(e)}")
+            return {}
+
+    def _save_rankings(self):
+        try:
+            self.ranking_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.ranking_path, "w") as f:
+                json.dump(self.rankings, f, indent=2)
+        except Exception as e:
+            self.logger.error(f"Error saving selector rankings: {str(e)}")
+
+    def ordered(self, step: str, selectors: List[str]) -> List[str]:
+        """Order candidates by last winner, then by win count, then as given."""
+        ranking = self.rankings.get(step, {})
+        wins = ranking.get("wins", {})
+        last = ranking.get("last")
+        return sorted(
+            selectors,
+            key=lambda s: (s != last, -wins.get(s, 0), selectors.index(s))
+        )
+
+    def _record(self, step: str, selector: str):
+        ranking = self.rankings.setdefault(step, {"last": None, "wins": {}})
+        ranking["wins"][selector] = ranking["wins"].get(selector, 0) + 1
+        if ranking["last"] != selector:
+            ranking["last"] = selector
+            self._save_rankings()
+        elif ranking["wins"][selector] % 10 == 0:
+            # Counts only break ties, so persist them occasionally
+            self._save_rankings()
+
+    async def _probe(self, page, selector: str, state: str) -> Optional[object]:
+        """Check a selector once without waiting."""
+        element = await page.query_selector(selector)
+        if element and (state != "visible" or await element.is_visible()):
+            return element
+        return None
+
+    async def resolve(
+        self,
+        page,
+        step: str,
+        selectors: List[str],
+        state: str = "visible",
+        timeout: Optional[int] = None
+    ) -> Tuple[str, object]:
+        """
+        Find the first selector that matches on the page.
+
+        The best-ranked selector is probed immediately; if it does not match,
+        every candidate is waited on at once. Whichever way a match is found,
+        selectors listed before it are probed again so that a more specific
+        candidate matching at the same moment wins over a generic one.
+
+        Args:
+            page: Playwright page to search
+            step: Name of the step, used as the ranking key
+            selectors: Candidate selectors, most specific first
+            state: Element state to wait for
+            timeout: Optional override of the default timeout in milliseconds
+
+        Returns:
+            Tuple of the winning selector and its element handle
+
+        Raises:
+            TimeoutError: If no candidate matches within the timeout
+        """
+        started = time.monotonic()
+        candidates = self.ordered(step, selectors)
+
+        element = await self._probe(page, candidates[0], state)
+        if element:
+            return await self._won(page, step, selectors, candidates[0], element, state, started)
+
+        timeout = timeout or self.timeout
+        tasks = {
+            asyncio.ensure_future(page.wait_for_selector(selector, state=state, timeout=timeout)): selector
+            for selector in candidates
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None and task.result():
+                        return await self._won(page, step, selectors, tasks[task], task.result(), state, started)
+        finally:
+            for task in pending:
+                task.cancel()
+            # Collect cancelled waits so their errors are not reported as unhandled
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        elapsed = (time.monotonic() - started) * 1000
+        self.logger.info(f"Selector step '{step}' unresolved after {elapsed:.0f}ms")
+        raise TimeoutError(f"No selector matched for step '{step}'")
+
+    async def _won(
+        self,
+        page,
+        step: str,
+        selectors: List[str],
+        selector: str,
+        element,
+        state: str,
+        started: float
+    ) -> Tuple[str, object]:
+        # Several candidates can match at once; prefer the one listed first
+        for preferred in selectors[:selectors.index(selector)]:
+            preferred_element = await self._probe(page, preferred, state)
+            if preferred_element:
+                selector, element = preferred, preferred_element
+                break
+        elapsed = (time.monotonic() - started) * 1000
+        self.logger.info(f"Selector step '{step}' resolved by {selector} in {elapsed:.0f}ms")
+        self._record(step, selector)
+        return selector, element
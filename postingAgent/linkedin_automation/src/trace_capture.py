@@ -0,0 +1,110 @@
+import asyncio
+import json
+import logging
+import time
+import zipfile
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class TraceRecorder:
+    def __init__(
+        self,
+        job_id: str,
+        output_dir: str = "traces",
+        debug_capture: bool = False,
+        capacity: int = 10
+    ):
+        """
+        Initialize a recorder that keeps recent debug state in memory.
+
+        Nothing touches the disk unless a step fails, in which case the ring
+        is written out as a single zip bundle named after the job.
+
+        Args:
+            job_id: Unique ID of the posting job, used as the bundle name
+            output_dir: Directory for failure bundles
+            debug_capture: Also snapshot the DOM and a screenshot at every
+                checkpoint, not only on failure
+            capacity: Number of snapshots kept in the ring
+        """
+        self.logger = logging.getLogger(__name__)
+        self.job_id = job_id
+        self.output_dir = Path(output_dir)
+        self.debug_capture = debug_capture
+        self.snapshots = deque(maxlen=capacity)
+        self.timings: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def step(self, name: str):
+        """Time a step; the duration is kept even if the step raises."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.timings[name] = round(time.monotonic() - started, 3)
+
+    async def _capture(self, page, label: str) -> Dict:
+        snapshot = {"label": label, "at": datetime.now().isoformat(), "url": None}
+        try:
+            snapshot["url"] = page.url
+            snapshot["dom"] = await page.content()
+            snapshot["screenshot"] = await page.screenshot(type="jpeg", quality=60)
+        except Exception as e:
+            snapshot["error"] = str(e)
+        return snapshot
+
+    async def checkpoint(self, page, label: str):
+        """Snapshot the page into the ring when debug capture is on."""
+        if self.debug_capture and page:
+            self.snapshots.append(await self._capture(page, label))
+
+    async def dump(self, page, reason: str) -> Optional[Path]:
+        """
+        Write the ring, timings and a final snapshot to <job_id>.zip.
+
+        Args:
+            page: Page to take a final snapshot of, if still open
+            reason: Why the step failed
+
+        Returns:
+            Path of the written bundle, or None if writing failed
+        """
+        snapshots: List[Dict] = list(self.snapshots)
+        if page and not page.is_closed():
+            snapshots.append(await self._capture(page, "failure"))
+
+        manifest = {
+            "job_id": self.job_id,
+            "reason": reason,
+            "written_at": datetime.now().isoformat(),
+            "timings": self.timings,
+            "snapshots": [
+                {k: v for k, v in s.items() if k not in ("dom", "screenshot")}
+                for s in snapshots
+            ]
+        }
+        path = self.output_dir / f"{self.job_id}.zip"
+        try:
+            # Encoding and compression stay off the event loop
+            await asyncio.to_thread(self._write_bundle, path, manifest, snapshots)
+            self.logger.info(f"Saved failure trace to {path}")
+            return path
+        except Exception as e:
+            self.logger.error(f"Error writing failure trace: {str(e)}")
+            return None
+
+    @staticmethod
+    def _write_bundle(path: Path, manifest: Dict, snapshots: List[Dict]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+            bundle.writestr("manifest.json", json.dumps(manifest, indent=2))
+            for index, snapshot in enumerate(snapshots):
+                prefix = f"{index:02d}_{snapshot['label']}"
+                if snapshot.get("dom"):
+                    bundle.writestr(f"{prefix}.html", snapshot["dom"])
+                if snapshot.get("screenshot"):
+                    bundle.writestr(f"{prefix}.jpg", snapshot["screenshot"])
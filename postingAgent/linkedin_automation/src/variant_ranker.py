@@ -0,0 +1,89 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set
+
+# LinkedIn cuts posts off behind "see more" after roughly this many characters
+SEE_MORE_CHARS = 210
+IDEAL_LENGTH = (600, 1300)
+IDEAL_HASHTAGS = (3, 5)
+
+WEIGHTS = {"length": 1.0, "hook": 1.5, "hashtags": 0.5, "novelty": 2.0}
+
+_HASHTAG = re.compile(r"#\w+")
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class RankedVariant:
+    """A candidate post with its total score and the per-heuristic scores."""
+    text: str
+    score: float
+    components: Dict[str, float] = field(default_factory=dict)
+
+
+def _shingles(text: str, size: int = 3) -> Set[str]:
+    words = _WORD.findall(text.lower())
+    return {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+
+
+def _length_score(text: str) -> float:
+    low, high = IDEAL_LENGTH
+    length = len(text)
+    if low <= length <= high:
+        return 1.0
+    if length < low:
+        return length / low
+    return max(0.0, 1.0 - (length - high) / high)
+
+
+def _hook_score(text: str) -> float:
+    """Reward an opening line that fits above "see more" and invites a click."""
+    first_line = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    if not first_line:
+        return 0.0
+    score = 1.0 if len(first_line) <= SEE_MORE_CHARS / 2 else 0.5 if len(first_line) <= SEE_MORE_CHARS else 0.0
+    if first_line.endswith("?") or any(char.isdigit() for char in first_line):
+        score += 0.5
+    return score / 1.5
+
+
+def _hashtag_score(text: str) -> float:
+    low, high = IDEAL_HASHTAGS
+    count = len(set(tag.lower() for tag in _HASHTAG.findall(text)))
+    if low <= count <= high:
+        return 1.0
+    return max(0.0, 1.0 - 0.25 * (low - count if count < low else count - high))
+
+
+def _novelty_score(shingles: Set[str], recent: List[Set[str]]) -> float:
+    """1 minus the highest Jaccard similarity to any recent post."""
+    if not recent or not shingles:
+        return 1.0
+    return 1.0 - max(len(shingles & other) / len(shingles | other) for other in recent)
+
+
+def rank_variants(candidates: Iterable[str], recent_posts: Iterable[str] = ()) -> List[RankedVariant]:
+    """
+    Score candidate posts with cheap local heuristics, best first.
+
+    Args:
+        candidates: Raw candidate posts
+        recent_posts: Recently published posts; candidates that repeat them score lower
+
+    Returns:
+        RankedVariants sorted by descending score
+    """
+    recent = [_shingles(post) for post in recent_posts if post]
+    ranked = []
+    for text in candidates:
+        components = {
+            "length": _length_score(text),
+            "hook": _hook_score(text),
+            "hashtags": _hashtag_score(text),
+            "novelty": _novelty_score(_shingles(text), recent),
+        }
+        score = sum(WEIGHTS[name] * value for name, value in components.items())
+        ranked.append(RankedVariant(
+            text, round(score, 3), {name: round(value, 3) for name, value in components.items()}
+        ))
+    return sorted(ranked, key=lambda variant: variant.score, reverse=True)